@@ -0,0 +1,96 @@
+"""
+Content-addressed store for figure images.
+
+Each image is written once under its sha256 digest (figure_blobs/ab/abcd....png),
+so the same figure extracted for several specs or re-extracted on a later run
+is stored a single time. The database only keeps the digest, format and
+dimensions; the bytes are read from disk when an image is actually requested.
+"""
+
+import hashlib
+import os
+import struct
+from pathlib import Path
+
+DEFAULT_BLOB_DIR = "figure_blobs"
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def image_format(data: bytes) -> str:
+    """Detect the image format from its leading bytes ("png", "webp", "jpeg" or "bin")."""
+    if data.startswith(PNG_SIGNATURE):
+        return "png"
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "webp"
+    if data.startswith(b"\xff\xd8\xff"):
+        return "jpeg"
+    return "bin"
+
+
+def image_dimensions(data: bytes) -> tuple:
+    """
+    Read (width, height) from a PNG or WebP header without decoding the image.
+
+    Returns (None, None) for other formats or truncated data.
+    """
+    try:
+        if data.startswith(PNG_SIGNATURE):
+            # The IHDR chunk always comes first
+            return struct.unpack(">II", data[16:24])
+
+        if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+            chunk = data[12:16]
+            if chunk == b"VP8X":
+                width = int.from_bytes(data[24:27], "little") + 1
+                height = int.from_bytes(data[27:30], "little") + 1
+                return width, height
+            if chunk == b"VP8L":
+                bits = int.from_bytes(data[21:25], "little")
+                return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+            if chunk == b"VP8 ":
+                width, height = struct.unpack("<HH", data[26:30])
+                return width & 0x3FFF, height & 0x3FFF
+    except struct.error:
+        pass
+    return None, None
+
+
+class BlobStore:
+    """Directory of images named by the sha256 of their content."""
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self.added = 0
+        self.reused = 0
+
+    def path(self, digest: str, fmt: str) -> Path:
+        """Location of a blob; the first two hex digits shard the directory."""
+        return self.root / digest[:2] / f"{digest}.{fmt}"
+
+    def put(self, data: bytes) -> tuple:
+        """
+        Store image bytes unless an identical image is already present.
+
+        Returns:
+            (digest, format) identifying the blob
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        fmt = image_format(data)
+        path = self.path(digest, fmt)
+        if path.exists():
+            self.reused += 1
+            return digest, fmt
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        self.added += 1
+        return digest, fmt
+
+    def get(self, digest: str, fmt: str) -> bytes:
+        """Read a blob's bytes."""
+        with open(self.path(digest, fmt), "rb") as f:
+            return f.read()
@@ -1,11 +1,15 @@
 from docling.document_converter import DocumentConverter, PdfFormatOption
 from docling.datamodel.pipeline_options import PdfPipelineOptions
 from docling.datamodel.base_models import InputFormat
+import pypdfium2
 import json
 import re
 import base64
 import os
 import argparse
+import pickle
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from io import BytesIO
 
 # Mapping of spec identifiers to human-readable names
@@ -16,6 +20,17 @@ SPEC_NAMES = {
     "80211ac": "IEEE 802.11ac (Wi-Fi 5)",
 }
 
+# Pages converted per unit of work (one docling convert call)
+DEFAULT_WINDOW_PAGES = 50
+
+# Written to the work directory; identifies it as holding checkpoints
+CHECKPOINT_MANIFEST = "manifest.json"
+
+# How figure images are encoded: "png" or lossless "webp", whether to spend
+# extra CPU on a smaller file, and the longest side in pixels (None keeps the
+# full images_scale=2.0 rendering)
+DEFAULT_IMAGE_OPTIONS = {"format": "png", "optimize": False, "max_size": None}
+
 
 def infer_section_level(title):
     """
@@ -40,183 +55,400 @@ def is_in_page_range(page, start_page, end_page):
     return True
 
 
-def extract_tables(doc, start_page=None, end_page=None):
+def create_converter():
+    """Create a docling converter configured to extract picture images."""
+    pipeline_options = PdfPipelineOptions()
+    pipeline_options.images_scale = 2.0
+    pipeline_options.generate_picture_images = True
+
+    return DocumentConverter(
+        format_options={
+            InputFormat.PDF: PdfFormatOption(pipeline_options=pipeline_options)
+        }
+    )
+
+
+def count_pages(pdf_path):
+    """Return the number of pages in a PDF."""
+    pdf = pypdfium2.PdfDocument(pdf_path)
+    try:
+        return len(pdf)
+    finally:
+        pdf.close()
+
+
+def page_windows(first_page, last_page, window_pages):
+    """Split an inclusive page range into consecutive (start, end) windows."""
+    window_pages = max(1, window_pages)
+    return [
+        (start, min(start + window_pages - 1, last_page))
+        for start in range(first_page, last_page + 1, window_pages)
+    ]
+
+
+def encode_image(pil_image, image_options=None):
     """
-    Extract tables from document with their captions and content.
-    Looks for 'Table' caption in section_header or caption above/below the table.
+    Encode a picture once, returning the bytes that are saved and embedded.
 
     Args:
-        doc: The parsed document
-        start_page: First page to include (1-indexed, inclusive)
-        end_page: Last page to include (1-indexed, inclusive)
+        pil_image: PIL image rendered by docling
+        image_options: Dict with "format" ("png" or "webp"), "optimize" and
+            "max_size" (longest side in pixels, or None); see DEFAULT_IMAGE_OPTIONS
     """
-    items = list(doc.iterate_items())
-    tables = []
-
-    for i, (item, level) in enumerate(items):
-        label = getattr(item, "label", None)
-        if label != "table":
-            continue
+    options = {**DEFAULT_IMAGE_OPTIONS, **(image_options or {})}
+
+    max_size = options["max_size"]
+    if max_size and max(pil_image.size) > max_size:
+        pil_image = pil_image.copy()
+        pil_image.thumbnail((max_size, max_size))
+
+    buffer = BytesIO()
+    if options["format"] == "webp":
+        # Lossless keeps spec diagrams and small text sharp; method trades CPU for size
+        pil_image.save(buffer, format="WEBP", lossless=True, quality=100,
+                       method=6 if options["optimize"] else 4)
+    else:
+        pil_image.save(buffer, format="PNG", optimize=options["optimize"])
+    return buffer.getvalue()
 
-        caption = None
-        page = item.prov[0].page_no if hasattr(item, 'prov') and item.prov else None
 
-        # Filter by page range
-        if not is_in_page_range(page, start_page, end_page):
-            continue
+def document_records(doc, image_options=None):
+    """
+    Flatten a docling document into plain, picklable records.
 
-        # Look above for caption starting with "Table"
-        if i > 0:
-            prev_item, _ = items[i - 1]
-            prev_label = getattr(prev_item, "label", None)
-            prev_text = getattr(prev_item, "text", "").strip()
-            if prev_label in ("section_header", "caption") and prev_text.startswith("Table"):
-                caption = prev_text
-
-        # If not found above, look below
-        if not caption and i < len(items) - 1:
-            next_item, _ = items[i + 1]
-            next_label = getattr(next_item, "label", None)
-            next_text = getattr(next_item, "text", "").strip()
-            if next_label in ("section_header", "caption") and next_text.startswith("Table"):
-                caption = next_text
+    One record is produced per item in reading order, so records from
+    consecutive page windows can be concatenated into the same stream a
+    whole-document conversion would give. Table content and picture
+    images are rendered here, while the document is still available.
+    Each picture is encoded exactly once (see encode_image).
+    """
+    image_format = (image_options or DEFAULT_IMAGE_OPTIONS).get("format", "png")
+    records = []
+    for item, level in doc.iterate_items():
+        label = getattr(item, "label", None)
+        record = {
+            "label": str(getattr(label, "value", label)),
+            "text": getattr(item, "text", "").strip(),
+            "page": item.prov[0].page_no if hasattr(item, 'prov') and item.prov else None,
+            "table": None,
+            "image": None,
+            "image_format": None,
+        }
 
         # Extract table content in markdown format
-        content = None
-        if hasattr(item, 'export_to_dataframe'):
+        if record["label"] == "table" and hasattr(item, 'export_to_dataframe'):
             df = item.export_to_dataframe()
-            content = df.to_markdown(index=False)
+            record["table"] = df.to_markdown(index=False)
+
+        # Extract picture as encoded image bytes
+        if record["label"] == "picture" and hasattr(item, 'get_image'):
+            try:
+                pil_image = item.get_image(doc)
+                if pil_image:
+                    record["image"] = encode_image(pil_image, image_options)
+                    record["image_format"] = image_format
+            except Exception as e:
+                print(f"Warning: Could not extract image on page {record['page']}: {e}")
+
+        records.append(record)
+
+    return records
+
+
+# Per-process converter, created once by _init_worker or on first use
+_converter = None
 
-        tables.append({
-            "caption": caption,
-            "page": page,
-            "content": content
-        })
 
-    return tables
+def _init_worker():
+    """Load docling models once per worker process."""
+    global _converter
+    _converter = create_converter()
 
 
-def extract_figures(doc, output_dir="figures", spec=None, start_page=None, end_page=None):
+def convert_window(pdf_path, window, checkpoint_path=None, image_options=None):
     """
-    Extract figures from document with their captions.
-    Saves images to files and stores base64 in the output.
+    Convert one (start, end) page window and return its records.
 
-    Args:
-        doc: The parsed document
-        output_dir: Base directory for figures (will use output_dir/{spec}/ if spec provided)
-        spec: Specification identifier for organizing output
-        start_page: First page to include (1-indexed, inclusive)
-        end_page: Last page to include (1-indexed, inclusive)
+    If checkpoint_path is given the records are also saved there once the
+    window is complete, so a later run can resume without converting it again.
     """
-    # If spec is provided, use figures/{spec}/ subdirectory
-    if spec:
-        output_dir = os.path.join(output_dir, spec)
-    items = list(doc.iterate_items())
-    figures = []
+    global _converter
+    if _converter is None:
+        _converter = create_converter()
+    result = _converter.convert(pdf_path, page_range=window)
+    records = document_records(result.document, image_options)
+    if checkpoint_path:
+        save_checkpoint(checkpoint_path, records)
+    return records
 
-    # Create output directory for images
-    os.makedirs(output_dir, exist_ok=True)
 
-    for i, (item, level) in enumerate(items):
-        label = getattr(item, "label", None)
-        if label != "picture":
-            continue
+def convert_window_to_checkpoint(pdf_path, window, checkpoint_path, image_options=None):
+    """Pool task: convert one window into its checkpoint, returning nothing so records are not sent back."""
+    convert_window(pdf_path, window, checkpoint_path, image_options)
 
-        caption = None
-        page = item.prov[0].page_no if hasattr(item, 'prov') and item.prov else None
 
-        # Filter by page range
-        if not is_in_page_range(page, start_page, end_page):
-            continue
+def checkpoint_file(checkpoint_dir, window):
+    """Path of the checkpoint for one page window."""
+    return os.path.join(checkpoint_dir, f"window_{window[0]:05d}_{window[1]:05d}.pkl")
 
-        # Look above for caption starting with "Figure"
-        if i > 0:
-            prev_item, _ = items[i - 1]
-            prev_label = getattr(prev_item, "label", None)
-            prev_text = getattr(prev_item, "text", "").strip()
-            if prev_label in ("section_header", "caption") and prev_text.startswith("Figure"):
-                caption = prev_text
-
-        # If not found above, look below
-        if not caption and i < len(items) - 1:
-            next_item, _ = items[i + 1]
-            next_label = getattr(next_item, "label", None)
-            next_text = getattr(next_item, "text", "").strip()
-            if next_label in ("section_header", "caption") and next_text.startswith("Figure"):
-                caption = next_text
-
-        # Extract image
-        image_base64 = None
-        image_path = None
-        if hasattr(item, 'get_image'):
-            try:
-                pil_image = item.get_image(doc)
-                if pil_image:
-                    # Generate filename from caption or index
-                    if caption:
-                        # Extract figure number (e.g., "9-1074o" from "Figure 9-1074o-...")
-                        match = re.search(r'Figure\s+([\d\-\w]+)', caption)
-                        filename = f"figure_{match.group(1)}.png" if match else f"figure_{i}.png"
-                    else:
-                        filename = f"figure_{i}.png"
-
-                    image_path = os.path.join(output_dir, filename)
-
-                    # Save to file
-                    pil_image.save(image_path, "PNG")
-
-                    # Convert to base64
-                    buffer = BytesIO()
-                    pil_image.save(buffer, format="PNG")
-                    image_base64 = base64.b64encode(buffer.getvalue()).decode('utf-8')
-            except Exception as e:
-                print(f"Warning: Could not extract image at index {i}: {e}")
 
-        figures.append({
-            "caption": caption,
-            "page": page,
-            "image_path": image_path,
-            "image_base64": image_base64
-        })
+def save_checkpoint(path, records):
+    """Write a window's records atomically, so a crash never leaves a partial checkpoint."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(records, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
 
-    return figures
+def load_checkpoint(path):
+    """Read a window's records back from its checkpoint."""
+    with open(path, "rb") as f:
+        return pickle.load(f)
 
 
-def extract_sections(pdf_path, output_path, spec=None, start_page=None, end_page=None):
+def is_checkpoint_file(name):
+    """Whether a file name is one the checkpointing writes (manifest, window pickles, temp files)."""
+    return (name == CHECKPOINT_MANIFEST or name.endswith(".tmp")
+            or (name.startswith("window_") and name.endswith(".pkl")))
+
+
+def clear_checkpoints(checkpoint_dir):
+    """
+    Delete the checkpoint files in a work directory, then the directory if it is empty.
+
+    Nothing else is touched, so pointing --work-dir at a directory with
+    other files never deletes them.
+    """
+    if not os.path.isdir(checkpoint_dir):
+        return
+    for name in os.listdir(checkpoint_dir):
+        if is_checkpoint_file(name):
+            os.remove(os.path.join(checkpoint_dir, name))
+    if not os.listdir(checkpoint_dir):
+        os.rmdir(checkpoint_dir)
+
+
+def foreign_work_dir(checkpoint_dir):
+    """Whether a directory exists with files in it but no checkpoint manifest."""
+    return (os.path.isdir(checkpoint_dir) and bool(os.listdir(checkpoint_dir))
+            and not os.path.exists(os.path.join(checkpoint_dir, CHECKPOINT_MANIFEST)))
+
+
+def prepare_checkpoints(checkpoint_dir, pdf_path, windows, resume, image_options=None):
     """
-    Extract sections from a PDF file and save to JSON.
+    Set up the checkpoint directory and return the windows already converted.
+
+    Checkpoints are only reused when resuming a run over the same PDF (same
+    size and modification time) split into the same windows with the same
+    image options; otherwise the directory is cleared and every window is
+    converted again.
+
+    Args:
+        checkpoint_dir: Directory holding per-window checkpoints
+        pdf_path: Path to the PDF file
+        windows: (start, end) page windows of this run
+        resume: Reuse checkpoints from an earlier, interrupted run
+        image_options: Figure image encoding options of this run
+
+    Returns:
+        Set of windows whose records can be loaded from checkpoints
+    """
+    stat = os.stat(pdf_path)
+    manifest = {
+        "pdf": os.path.abspath(pdf_path),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "windows": [list(window) for window in windows],
+        "images": {**DEFAULT_IMAGE_OPTIONS, **(image_options or {})},
+    }
+    manifest_path = os.path.join(checkpoint_dir, CHECKPOINT_MANIFEST)
+
+    if resume and os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            previous = json.load(f)
+        if previous == manifest:
+            return {window for window in windows if os.path.exists(checkpoint_file(checkpoint_dir, window))}
+        print(f"Checkpoints in {checkpoint_dir} are for a different PDF or page range, starting over")
+
+    clear_checkpoints(checkpoint_dir)
+    os.makedirs(checkpoint_dir, exist_ok=True)
+    with open(manifest_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    return set()
+
+
+def iter_records(pdf_path, start_page=None, end_page=None, workers=1, window_pages=DEFAULT_WINDOW_PAGES,
+                 checkpoint_dir=None, resume=False, image_options=None):
+    """
+    Convert a PDF in page windows and yield the records of all windows in order.
+
+    Windows are converted in-process when workers is 1, otherwise across a
+    process pool. Either way records are yielded in page order, so the
+    result does not depend on the worker count. The pool keeps at most
+    workers * 2 windows in flight, so memory stays bounded however slow an
+    early window is.
+
+    With a checkpoint_dir, each window's records are saved as soon as it is
+    converted; with resume, windows checkpointed by an earlier run are loaded
+    instead of converted.
 
     Args:
         pdf_path: Path to the PDF file
-        output_path: Path for the output JSON file
-        spec: Specification identifier (e.g., "80211be", "80211bn")
         start_page: First page to include (1-indexed, inclusive)
         end_page: Last page to include (1-indexed, inclusive)
+        workers: Number of conversion processes
+        window_pages: Pages per conversion window
+        checkpoint_dir: Directory for per-window checkpoints (None disables checkpointing)
+        resume: Skip windows already checkpointed in checkpoint_dir
+        image_options: Figure image encoding options (see DEFAULT_IMAGE_OPTIONS)
+    """
+    first_page = start_page or 1
+    last_page = min(end_page, count_pages(pdf_path)) if end_page else count_pages(pdf_path)
+    windows = page_windows(first_page, last_page, window_pages)
+
+    done = prepare_checkpoints(checkpoint_dir, pdf_path, windows, resume, image_options) if checkpoint_dir else set()
+    pending = [window for window in windows if window not in done]
+    checkpoints = {
+        window: checkpoint_file(checkpoint_dir, window) if checkpoint_dir else None
+        for window in windows
+    }
+    print(f"Converting pages {first_page}-{last_page} in {len(windows)} windows with {workers} worker(s)")
+    if done:
+        print(f"  Resuming: {len(done)} window(s) already converted, {len(pending)} remaining")
+
+    if workers <= 1 or len(pending) <= 1:
+        for window in windows:
+            if window in done:
+                yield from load_checkpoint(checkpoints[window])
+            else:
+                yield from convert_window(pdf_path, window, checkpoints[window], image_options)
+                print(f"  Converted pages {window[0]}-{window[1]}")
+        return
+
+    # Workers write their own checkpoints, so a window finished out of order
+    # is kept even if the run dies before its records are consumed here. The
+    # records are then read back from the checkpoint when the window's turn
+    # comes instead of being pickled back to this process.
+    task = convert_window_to_checkpoint if checkpoint_dir else convert_window
+    to_submit = iter(pending)
+    in_flight = deque()
+
+    def submit_next(pool):
+        window = next(to_submit, None)
+        if window is not None:
+            in_flight.append(pool.submit(task, pdf_path, window, checkpoints[window], image_options))
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        # At most workers * 2 windows are converting or waiting to be consumed,
+        # so a slow early window cannot pile up the rest of the document here
+        for _ in range(workers * 2):
+            submit_next(pool)
+        for window in windows:
+            if window in done:
+                yield from load_checkpoint(checkpoints[window])
+                continue
+            records = in_flight.popleft().result()
+            submit_next(pool)
+            if records is None:
+                records = load_checkpoint(checkpoints[window])
+            yield from records
+            print(f"  Converted pages {window[0]}-{window[1]}")
+
+
+def with_neighbours(records):
+    """Yield (index, previous, record, next) for a record stream, holding only three records."""
+    records = iter(records)
+    prev = None
+    current = next(records, None)
+    index = 0
+    while current is not None:
+        following = next(records, None)
+        yield index, prev, current, following
+        prev, current = current, following
+        index += 1
+
+
+def find_caption(prev, following, prefix):
+    """Find a caption starting with prefix just above, or else just below, a record."""
+    # Look above for caption
+    if prev and prev["label"] in ("section_header", "caption") and prev["text"].startswith(prefix):
+        return prev["text"]
+
+    # If not found above, look below
+    if following and following["label"] in ("section_header", "caption") and following["text"].startswith(prefix):
+        return following["text"]
+
+    return None
+
+
+def save_figure(record, index, caption, output_dir):
+    """
+    Save a picture record's image (already encoded during conversion).
 
     Returns:
-        List of extracted sections
+        (image_path, image_base64), or (None, None) if the record has no image
     """
-    # Configure pipeline to extract images
-    pipeline_options = PdfPipelineOptions()
-    pipeline_options.images_scale = 2.0
-    pipeline_options.generate_picture_images = True
+    if not record["image"]:
+        return None, None
+
+    # Generate filename from caption or index
+    if caption:
+        # Extract figure number (e.g., "9-1074o" from "Figure 9-1074o-...")
+        match = re.search(r'Figure\s+([\d\-\w]+)', caption)
+        filename = f"figure_{match.group(1)}" if match else f"figure_{index}"
+    else:
+        filename = f"figure_{index}"
+    filename += f".{record['image_format'] or 'png'}"
 
-    converter = DocumentConverter(
-        format_options={
-            InputFormat.PDF: PdfFormatOption(pipeline_options=pipeline_options)
-        }
-    )
-    result = converter.convert(pdf_path)
-    doc = result.document
+    image_path = os.path.join(output_dir, filename)
+
+    # Save to file
+    with open(image_path, "wb") as f:
+        f.write(record["image"])
+
+    # Convert to base64
+    return image_path, base64.b64encode(record["image"]).decode('utf-8')
+
+
+def enclosing_section(section):
+    """Section fields recorded on a table or figure: the section it appears in, by reading order."""
+    return {
+        "section_title": section["section_title"] if section else None,
+        "section_level": section["level"] if section else None,
+    }
+
+
+def extract_content(records, output_dir="figures", spec=None, start_page=None, end_page=None):
+    """
+    Extract sections, tables and figures from a record stream in a single pass.
+
+    Yields ("section" | "table" | "figure", item) pairs in document order
+    (a section is yielded once its text is complete). Tables and figures
+    carry the title and level of the section they appear in. Captions are found
+    in a three-record look-behind/look-ahead window, so memory use does not
+    depend on document size.
+
+    Args:
+        records: Document records, e.g. from iter_records()
+        output_dir: Base directory for figures (will use output_dir/{spec}/ if spec provided)
+        spec: Specification identifier for organizing output
+        start_page: First page to include (1-indexed, inclusive)
+        end_page: Last page to include (1-indexed, inclusive)
+    """
+    # If spec is provided, use figures/{spec}/ subdirectory
+    if spec:
+        output_dir = os.path.join(output_dir, spec)
+
+    # Create output directory for images
+    os.makedirs(output_dir, exist_ok=True)
 
-    sections = []
     current_section = None
     current_text = []
 
-    for item, level in doc.iterate_items():
-        label = getattr(item, "label", None)
-        text = getattr(item, "text", "").strip()
-        page = item.prov[0].page_no if hasattr(item, 'prov') and item.prov else None
+    for index, prev, record, following in with_neighbours(records):
+        label = record["label"]
+        text = record["text"]
+        page = record["page"]
 
         # Filter by page range
         if not is_in_page_range(page, start_page, end_page):
@@ -228,10 +460,10 @@ def extract_sections(pdf_path, output_path, spec=None, start_page=None, end_page
                            re.match(r'^\d+', text))
 
         if is_valid_section:
-            # Save previous section
+            # Emit previous section
             if current_section:
                 current_section["text"] = "\n".join(current_text)
-                sections.append(current_section)
+                yield "section", current_section
 
             # Start new section
             current_section = {
@@ -244,38 +476,115 @@ def extract_sections(pdf_path, output_path, spec=None, start_page=None, end_page
         elif label in ("text", "paragraph", "list_item") and text and current_section:
             current_text.append(text)
 
+        elif label == "table":
+            yield "table", {
+                "caption": find_caption(prev, following, "Table"),
+                "page": page,
+                "content": record["table"],
+                **enclosing_section(current_section)
+            }
+
+        elif label == "picture":
+            caption = find_caption(prev, following, "Figure")
+            image_path, image_base64 = save_figure(record, index, caption, output_dir)
+            yield "figure", {
+                "caption": caption,
+                "page": page,
+                "image_path": image_path,
+                "image_base64": image_base64,
+                **enclosing_section(current_section)
+            }
+
     # Don't forget last section
     if current_section:
         current_section["text"] = "\n".join(current_text)
-        sections.append(current_section)
+        yield "section", current_section
+
 
-    # Extract tables and figures
-    tables = extract_tables(doc, start_page, end_page)
-    figures = extract_figures(doc, spec=spec, start_page=start_page, end_page=end_page)
+def extract_sections(pdf_path, output_path, spec=None, start_page=None, end_page=None,
+                     workers=1, window_pages=DEFAULT_WINDOW_PAGES, output_format="json",
+                     checkpoint_dir=None, resume=False, image_options=None):
+    """
+    Extract sections from a PDF file and save to JSON or JSONL.
+
+    The PDF is converted in page windows, optionally in parallel; records
+    from all windows are stitched back into one stream and sections,
+    tables and figures are extracted from it in a single pass, so sections
+    that straddle a window boundary come out the same as in a serial run.
+
+    With output_format="jsonl" the first line holds the spec metadata and
+    every following line is one section, table or figure (tagged with a
+    "type" field), written as soon as it is extracted, so nothing is held
+    in memory.
+
+    With a checkpoint_dir, converted page windows are saved as they finish
+    and resume=True picks up an interrupted run where it left off. The
+    checkpoints are removed once the output file has been written.
+
+    Args:
+        pdf_path: Path to the PDF file
+        output_path: Path for the output file
+        spec: Specification identifier (e.g., "80211be", "80211bn")
+        start_page: First page to include (1-indexed, inclusive)
+        end_page: Last page to include (1-indexed, inclusive)
+        workers: Number of conversion processes
+        window_pages: Pages per conversion window
+        output_format: "json" (single document) or "jsonl" (one record per line)
+        checkpoint_dir: Directory for per-window checkpoints (None disables checkpointing)
+        resume: Reuse checkpoints left by an earlier, interrupted run
+        image_options: Figure image encoding options (see DEFAULT_IMAGE_OPTIONS)
 
-    # Build output with spec metadata if provided
-    output = {"sections": sections, "tables": tables, "figures": figures}
+    Returns:
+        Dict of extracted item counts by type ("section", "table", "figure")
+    """
+    # Spec metadata if provided
+    header = {}
     if spec:
-        output["spec"] = spec
-        output["spec_name"] = SPEC_NAMES.get(spec, f"IEEE 802.11 ({spec})")
+        header["spec"] = spec
+        header["spec_name"] = SPEC_NAMES.get(spec, f"IEEE 802.11 ({spec})")
 
     # Add page range info if specified
     if start_page or end_page:
-        output["page_range"] = {
+        header["page_range"] = {
             "start": start_page,
             "end": end_page
         }
 
-    with open(output_path, "w") as f:
-        json.dump(output, f, indent=2)
+    records = iter_records(pdf_path, start_page, end_page, workers, window_pages, checkpoint_dir, resume,
+                           image_options)
+    items = extract_content(records, spec=spec, start_page=start_page, end_page=end_page)
+    counts = {"section": 0, "table": 0, "figure": 0}
+
+    if output_format == "jsonl":
+        with open(output_path, "w") as f:
+            f.write(json.dumps({"type": "spec", **header}) + "\n")
+            for kind, item in items:
+                f.write(json.dumps({"type": kind, **item}) + "\n")
+                counts[kind] += 1
+    else:
+        # Single pass over the document for sections, tables and figures
+        content = {"section": [], "table": [], "figure": []}
+        for kind, item in items:
+            content[kind].append(item)
+            counts[kind] += 1
+
+        output = {"sections": content["section"], "tables": content["table"], "figures": content["figure"]}
+        output.update(header)
+
+        with open(output_path, "w") as f:
+            json.dump(output, f, indent=2)
+
+    if checkpoint_dir:
+        clear_checkpoints(checkpoint_dir)
 
     page_info = ""
     if start_page or end_page:
         page_info = f" (pages {start_page or 1}-{end_page or 'end'})"
-    print(f"Extracted {len(sections)} sections, {len(tables)} tables, {len(figures)} figures{page_info} to {output_path}")
+    print(f"Extracted {counts['section']} sections, {counts['table']} tables, "
+          f"{counts['figure']} figures{page_info} to {output_path}")
     if spec:
-        print(f"Spec: {output['spec_name']}")
-    return sections, tables, figures
+        print(f"Spec: {header['spec_name']}")
+    return counts
 
 
 if __name__ == "__main__":
@@ -289,7 +598,13 @@ if __name__ == "__main__":
     )
     parser.add_argument(
         "--output",
-        help="Output JSON filename (default: {spec}_output.json or sections_output.json)"
+        help="Output filename (default: {spec}_output.json[l] or sections_output.json[l])"
+    )
+    parser.add_argument(
+        "--format",
+        choices=["json", "jsonl"],
+        default="json",
+        help="Output format: one JSON document, or streamed JSONL with one record per line (default: json)"
     )
     parser.add_argument(
         "--start-page",
@@ -301,6 +616,48 @@ if __name__ == "__main__":
         type=int,
         help="Last page to extract (1-indexed, inclusive)"
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of processes converting page windows in parallel (default: 1)"
+    )
+    parser.add_argument(
+        "--window-pages",
+        type=int,
+        default=DEFAULT_WINDOW_PAGES,
+        help=f"Pages per conversion window (default: {DEFAULT_WINDOW_PAGES})"
+    )
+    parser.add_argument(
+        "--work-dir",
+        help="Directory for per-window checkpoints (default: {output}.work)"
+    )
+    parser.add_argument(
+        "--no-checkpoint",
+        action="store_true",
+        help="Do not checkpoint converted page windows"
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Resume an interrupted run, skipping page windows already checkpointed"
+    )
+    parser.add_argument(
+        "--image-format",
+        choices=["png", "webp"],
+        default=DEFAULT_IMAGE_OPTIONS["format"],
+        help="Figure image format; webp is lossless and usually much smaller (default: png)"
+    )
+    parser.add_argument(
+        "--optimize-images",
+        action="store_true",
+        help="Spend extra CPU compressing figure images (lossless)"
+    )
+    parser.add_argument(
+        "--max-image-size",
+        type=int,
+        help="Downscale figure images so their longest side is at most this many pixels"
+    )
 
     args = parser.parse_args()
 
@@ -308,14 +665,30 @@ if __name__ == "__main__":
     if args.output:
         output_path = args.output
     elif args.spec:
-        output_path = f"{args.spec}_output.json"
+        output_path = f"{args.spec}_output.{args.format}"
     else:
-        output_path = "sections_output.json"
+        output_path = f"sections_output.{args.format}"
+
+    if args.no_checkpoint and args.resume:
+        parser.error("--resume requires checkpoints (remove --no-checkpoint)")
+    checkpoint_dir = None if args.no_checkpoint else (args.work_dir or f"{output_path}.work")
+    if checkpoint_dir and foreign_work_dir(checkpoint_dir):
+        parser.error(f"--work-dir {checkpoint_dir} is not empty and holds no checkpoints; choose another directory")
 
     extract_sections(
         args.pdf,
         output_path,
         spec=args.spec,
         start_page=args.start_page,
-        end_page=args.end_page
+        end_page=args.end_page,
+        workers=args.workers,
+        window_pages=args.window_pages,
+        output_format=args.format,
+        checkpoint_dir=checkpoint_dir,
+        resume=args.resume,
+        image_options={
+            "format": args.image_format,
+            "optimize": args.optimize_images,
+            "max_size": args.max_image_size,
+        }
     )
@@ -0,0 +1,108 @@
+"""
+Split long section text into overlapping passages for embedding.
+
+all-MiniLM-L6-v2 truncates input at 256 word pieces, so embedding a whole
+section only captures its opening paragraphs. Sections are split on sentence
+boundaries into passages that fit the model, with a few sentences of overlap
+so a statement spanning two passages is still embedded in one of them.
+"""
+
+import re
+
+# Roughly one match per word piece: words, numbers, and punctuation marks.
+# Only a fallback; store_to_vectordb.py counts with the model's tokenizer.
+TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+# Paragraph breaks, or sentence-ending punctuation followed by a capital/number/bracket
+SENTENCE_BOUNDARY = re.compile(r"\n+|(?<=[.;:!?])\s+(?=[A-Z0-9(\"])")
+
+# Default passage size leaves headroom under the 256 word-piece model limit,
+# for the special tokens and for the regex fallback, which undercounts rare
+# terms (EMLSR, NSTR) that split into several word pieces
+DEFAULT_MAX_TOKENS = 200
+DEFAULT_OVERLAP_TOKENS = 40
+
+
+def count_tokens(text: str) -> int:
+    """Approximate the number of word pieces in text."""
+    return len(TOKEN_PATTERN.findall(text))
+
+
+def split_sentences(text: str) -> list:
+    """Split text into sentences, dropping empty fragments."""
+    return [s.strip() for s in SENTENCE_BOUNDARY.split(text) if s and s.strip()]
+
+
+def _split_long_sentence(sentence: str, max_tokens: int, count=count_tokens) -> list:
+    """Hard-split a single sentence that is longer than max_tokens on word boundaries."""
+    pieces = []
+    current = []
+    current_tokens = 0
+    for word in sentence.split():
+        word_tokens = count(word)
+        if current and current_tokens + word_tokens > max_tokens:
+            pieces.append(" ".join(current))
+            current = []
+            current_tokens = 0
+        current.append(word)
+        current_tokens += word_tokens
+    if current:
+        pieces.append(" ".join(current))
+    return pieces
+
+
+def chunk_text(text: str, max_tokens: int = DEFAULT_MAX_TOKENS,
+               overlap_tokens: int = DEFAULT_OVERLAP_TOKENS, count=count_tokens) -> list:
+    """
+    Split text into passages of at most max_tokens on sentence boundaries.
+
+    Consecutive passages share up to overlap_tokens worth of trailing
+    sentences. Text that already fits is returned as a single passage.
+
+    Args:
+        text: The text to split
+        max_tokens: Maximum tokens per passage (0 disables chunking)
+        overlap_tokens: Tokens of trailing context repeated at the start of the next passage
+        count: Token counting function
+
+    Returns:
+        List of passage strings
+    """
+    if not text or not text.strip():
+        return []
+    if max_tokens <= 0 or count(text) <= max_tokens:
+        return [text]
+
+    sentences = []
+    for sentence in split_sentences(text):
+        if count(sentence) > max_tokens:
+            sentences.extend(_split_long_sentence(sentence, max_tokens, count))
+        else:
+            sentences.append(sentence)
+
+    chunks = []
+    current = []  # (sentence, tokens) pairs in the passage being built
+    current_tokens = 0
+    for sentence in sentences:
+        tokens = count(sentence)
+        if current and current_tokens + tokens > max_tokens:
+            chunks.append("\n".join(s for s, _ in current))
+
+            # Carry trailing sentences forward as overlap
+            overlap = []
+            overlap_total = 0
+            for prev, prev_tokens in reversed(current):
+                if overlap_total + prev_tokens > overlap_tokens or overlap_total + prev_tokens + tokens > max_tokens:
+                    break
+                overlap.insert(0, (prev, prev_tokens))
+                overlap_total += prev_tokens
+            current = overlap
+            current_tokens = overlap_total
+
+        current.append((sentence, tokens))
+        current_tokens += tokens
+
+    if current:
+        chunks.append("\n".join(s for s, _ in current))
+
+    return chunks
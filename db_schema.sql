@@ -21,6 +21,8 @@ CREATE TABLE IF NOT EXISTS sections (
     level INTEGER,
     page INTEGER,
     text TEXT,
+    sort_key TEXT,
+    parent_section TEXT,
     FOREIGN KEY (spec_id) REFERENCES specifications(spec_id)
 );
 
@@ -37,7 +39,7 @@ CREATE TABLE IF NOT EXISTS tables (
     FOREIGN KEY (spec_id) REFERENCES specifications(spec_id)
 );
 
--- Figures table (with section context)
+-- Figures table (with section context; image bytes live in the blob store, keyed by image_hash)
 CREATE TABLE IF NOT EXISTS figures (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     spec_id TEXT NOT NULL,
@@ -45,7 +47,11 @@ CREATE TABLE IF NOT EXISTS figures (
     caption TEXT,
     page INTEGER,
     image_path TEXT,
-    image_base64 TEXT,
+    image_hash TEXT,
+    image_format TEXT,
+    image_width INTEGER,
+    image_height INTEGER,
+    image_bytes INTEGER,
     section_number TEXT,
     level INTEGER,
     FOREIGN KEY (spec_id) REFERENCES specifications(spec_id)
@@ -55,9 +61,55 @@ CREATE TABLE IF NOT EXISTS figures (
 CREATE INDEX IF NOT EXISTS idx_sections_spec ON sections(spec_id);
 CREATE INDEX IF NOT EXISTS idx_sections_number ON sections(section_number);
 CREATE INDEX IF NOT EXISTS idx_sections_page ON sections(page);
+CREATE INDEX IF NOT EXISTS idx_sections_sort ON sections(spec_id, sort_key);
+CREATE INDEX IF NOT EXISTS idx_sections_level_sort ON sections(level, spec_id, sort_key);
+CREATE INDEX IF NOT EXISTS idx_sections_parent ON sections(parent_section, spec_id, sort_key);
 CREATE INDEX IF NOT EXISTS idx_tables_spec ON tables(spec_id);
 CREATE INDEX IF NOT EXISTS idx_tables_number ON tables(table_number);
+CREATE INDEX IF NOT EXISTS idx_tables_spec_number ON tables(spec_id, table_number);
 CREATE INDEX IF NOT EXISTS idx_tables_section ON tables(section_number);
 CREATE INDEX IF NOT EXISTS idx_figures_spec ON figures(spec_id);
 CREATE INDEX IF NOT EXISTS idx_figures_number ON figures(figure_number);
+CREATE INDEX IF NOT EXISTS idx_figures_spec_number ON figures(spec_id, figure_number);
 CREATE INDEX IF NOT EXISTS idx_figures_section ON figures(section_number);
+
+-- Section hierarchy closure: one row per (ancestor, descendant) section number pair,
+-- including each section itself at depth 0, for index-backed subtree queries
+CREATE TABLE IF NOT EXISTS section_ancestors (
+    spec_id TEXT NOT NULL,
+    ancestor TEXT NOT NULL,
+    descendant TEXT NOT NULL,
+    depth INTEGER NOT NULL,
+    PRIMARY KEY (ancestor, spec_id, descendant)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_section_ancestors_spec ON section_ancestors(spec_id, descendant);
+
+-- Summary counts refreshed by store_to_db.py, so stats tools need one small query
+CREATE TABLE IF NOT EXISTS spec_stats (
+    spec_id TEXT PRIMARY KEY,
+    sections INTEGER NOT NULL,
+    tables INTEGER NOT NULL,
+    figures INTEGER NOT NULL
+);
+-- Sections per level, with the first few sections (JSON [[number, title], ...]) as samples
+CREATE TABLE IF NOT EXISTS level_stats (
+    spec_id TEXT NOT NULL,
+    level INTEGER,
+    sections INTEGER NOT NULL,
+    samples TEXT,
+    PRIMARY KEY (spec_id, level)
+);
+
+-- Full-text indexes (external content: text lives only in the tables above)
+CREATE VIRTUAL TABLE IF NOT EXISTS sections_fts USING fts5(
+    section_title, text,
+    content='sections', content_rowid='id', tokenize='porter unicode61'
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS tables_fts USING fts5(
+    caption, content_markdown,
+    content='tables', content_rowid='id', tokenize='porter unicode61'
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS figures_fts USING fts5(
+    caption,
+    content='figures', content_rowid='id', tokenize='porter unicode61'
+);
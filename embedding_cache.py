@@ -0,0 +1,114 @@
+"""
+Persistent on-disk cache of document embeddings.
+
+Embeddings are keyed by (model name, sha256 of the text) and stored as
+float32 blobs in a small SQLite database, so re-indexing unchanged text or
+building a second collection from the same specs skips the model entirely.
+"""
+
+import hashlib
+import sqlite3
+import time
+from array import array
+
+DEFAULT_CACHE_PATH = "embedding_cache.db"
+DEFAULT_MAX_MB = 1024
+
+# Max host parameters per lookup query (SQLite's default limit is 999 on older builds)
+LOOKUP_BATCH = 500
+
+
+def text_key(text: str) -> str:
+    """Cache key for a document's text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """SQLite-backed embedding cache for one model, with an LRU size cap."""
+
+    def __init__(self, path: str, model_name: str, max_mb: int = DEFAULT_MAX_MB):
+        self.path = path
+        self.model_name = model_name
+        self.max_bytes = max_mb * 1024 * 1024
+        self.hits = 0
+        self.misses = 0
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS embeddings (
+                model TEXT NOT NULL,
+                text_hash TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (model, text_hash)
+            ) WITHOUT ROWID
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings(last_used)")
+        self.conn.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self) -> None:
+        """Apply the size cap and close the database."""
+        self.evict_to_size()
+        self.conn.close()
+
+    def get_many(self, texts: list) -> list:
+        """Return cached embeddings aligned with texts, None where missing."""
+        keys = [text_key(t) for t in texts]
+        found = {}
+        for start in range(0, len(keys), LOOKUP_BATCH):
+            chunk = keys[start:start + LOOKUP_BATCH]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self.conn.execute(
+                f"SELECT text_hash, vector FROM embeddings WHERE model = ? AND text_hash IN ({placeholders})",
+                [self.model_name, *chunk]
+            )
+            for text_hash, vector in rows:
+                found[text_hash] = array("f", vector).tolist()
+
+        if found:
+            now = time.time()
+            self.conn.executemany(
+                "UPDATE embeddings SET last_used = ? WHERE model = ? AND text_hash = ?",
+                ((now, self.model_name, key) for key in found)
+            )
+            self.conn.commit()
+
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return [found.get(key) for key in keys]
+
+    def put_many(self, texts: list, embeddings: list) -> None:
+        """Store embeddings for texts."""
+        now = time.time()
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO embeddings (model, text_hash, vector, last_used) VALUES (?, ?, ?, ?)",
+            ((self.model_name, text_key(t), array("f", e).tobytes(), now) for t, e in zip(texts, embeddings))
+        )
+        self.conn.commit()
+
+    def evict_model(self, model_name: str) -> int:
+        """Delete every cached embedding for a model. Returns rows removed."""
+        cursor = self.conn.execute("DELETE FROM embeddings WHERE model = ?", (model_name,))
+        self.conn.commit()
+        return cursor.rowcount
+
+    def evict_to_size(self) -> int:
+        """Delete least recently used embeddings until the cache fits max_bytes."""
+        cursor = self.conn.execute("""
+            DELETE FROM embeddings WHERE (model, text_hash) IN (
+                SELECT model, text_hash FROM (
+                    SELECT model, text_hash,
+                           SUM(LENGTH(vector)) OVER (ORDER BY last_used DESC, model, text_hash) AS running
+                    FROM embeddings
+                ) WHERE running > ?
+            )
+        """, (self.max_bytes,))
+        self.conn.commit()
+        return cursor.rowcount
@@ -5,13 +5,29 @@ Provides semantic search (ChromaDB) and structured queries (SQLite) over
 IEEE 802.11 specification content including sections, tables, and figures.
 """
 
+import asyncio
+import base64
+import json
 import logging
+import os
+import re
 import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import chromadb
 from chromadb.utils import embedding_functions
-from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp import FastMCP, Image
+
+from blob_store import BlobStore
+from index_manifest import (
+    ENTRY_FIELDS, count_collection, entry_count, has_passage_counts, load_manifest, manifest_path,
+)
+from store_to_db import extract_figure_number, extract_section_number, extract_table_number
 
 # Configure logging to stderr (required for STDIO transport)
 logging.basicConfig(
@@ -26,33 +42,615 @@ mcp = FastMCP("ieee80211")
 # Database configuration
 CHROMA_DB_PATH = Path(__file__).parent / "chroma_db"
 SQLITE_DB_PATH = Path(__file__).parent / "ieee80211.db"
+BLOB_DIR = Path(__file__).parent / "figure_blobs"
 COLLECTION_NAME = "ieee_80211"
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
+# Worker pools (override via environment, e.g. in the MCP client config)
+IO_WORKERS = int(os.environ.get("IEEE80211_IO_WORKERS", "8"))
+EMBED_WORKERS = int(os.environ.get("IEEE80211_EMBED_WORKERS", "2"))
+
+# In-process caches (entries; TTL in seconds)
+QUERY_CACHE_SIZE = int(os.environ.get("IEEE80211_QUERY_CACHE_SIZE", "1024"))
+RESULT_CACHE_SIZE = int(os.environ.get("IEEE80211_RESULT_CACHE_SIZE", "256"))
+RESULT_CACHE_TTL = float(os.environ.get("IEEE80211_RESULT_CACHE_TTL", "300"))
+
+# Default size budget of a search reply, in characters (0 = unlimited)
+MAX_RESPONSE_CHARS = int(os.environ.get("IEEE80211_MAX_RESPONSE_CHARS", "20000"))
+
+
+class SearchRuntime:
+    """Process-lifetime ChromaDB client, embedding model, and collection.
+
+    Everything is opened lazily on first use and shared by all tools, so a
+    search only pays for the query itself. Call reload() after the on-disk
+    index has been rebuilt to reopen the client and collection.
+    """
+
+    def __init__(self, db_path: Path, collection_name: str, model_name: str):
+        self.db_path = db_path
+        self.collection_name = collection_name
+        self.model_name = model_name
+        self.generation = 0
+        self._manifest_mtime = None
+        self._manifest_generation = None
+        self._lock = threading.Lock()
+        self._embedding_function = None
+        self._client = None
+        self._collection = None
+
+    def get_embedding_function(self):
+        """Get the shared sentence-transformers embedding function."""
+        with self._lock:
+            if self._embedding_function is None:
+                logger.info(f"Loading embedding model: {self.model_name}")
+                self._embedding_function = embedding_functions.SentenceTransformerEmbeddingFunction(
+                    model_name=self.model_name
+                )
+            return self._embedding_function
+
+    def get_collection(self):
+        """Get the shared ChromaDB collection, opening it on first use."""
+        ef = self.get_embedding_function()
+        with self._lock:
+            if self._collection is None:
+                if self._client is None:
+                    logger.info(f"Opening ChromaDB at {self.db_path}")
+                    self._client = chromadb.PersistentClient(path=str(self.db_path))
+                self._collection = self._client.get_collection(
+                    self.collection_name, embedding_function=ef
+                )
+            return self._collection
+
+    def index_version(self) -> tuple:
+        """Version of the index for cache keys: (reload generation, manifest generation).
+
+        store_to_vectordb.py bumps the manifest generation on every ingestion,
+        so cached results are dropped after a re-ingestion even without
+        reload(). The manifest is only re-read when its modification time
+        changes, so this costs one stat() per call.
+        """
+        try:
+            mtime = manifest_path(self.db_path).stat().st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        if mtime != self._manifest_mtime:
+            manifest = load_manifest(self.db_path) if mtime is not None else None
+            self._manifest_generation = (manifest or {}).get("generation")
+            self._manifest_mtime = mtime
+        return self.generation, self._manifest_generation
+
+    def reload(self) -> int:
+        """Drop the cached client and collection so the next call reopens them.
+
+        The embedding model is kept since it does not depend on the index.
+        Returns the new index generation.
+        """
+        with self._lock:
+            if self._client is not None:
+                # PersistentClient instances are cached per path inside chromadb
+                self._client.clear_system_cache()
+            self._client = None
+            self._collection = None
+            self.generation += 1
+            logger.info(f"Search runtime reloaded (generation {self.generation})")
+            return self.generation
+
+
+runtime = SearchRuntime(CHROMA_DB_PATH, COLLECTION_NAME, EMBEDDING_MODEL)
 
 
 def get_embedding_function():
     """Get the sentence-transformers embedding function."""
-    return embedding_functions.SentenceTransformerEmbeddingFunction(
-        model_name="all-MiniLM-L6-v2"
-    )
+    return runtime.get_embedding_function()
 
 
 def get_collection():
     """Get the ChromaDB collection."""
-    client = chromadb.PersistentClient(path=str(CHROMA_DB_PATH))
-    ef = get_embedding_function()
-    return client.get_collection(COLLECTION_NAME, embedding_function=ef)
+    return runtime.get_collection()
+
+
+class BoundedExecutor:
+    """Fixed-size thread pool that records queue depth and wait times.
+
+    Tools are async, but ChromaDB, SQLite and model inference all block, so
+    every such call is dispatched through one of these pools to keep the
+    event loop free for other clients.
+    """
+
+    def __init__(self, name: str, max_workers: int):
+        self.name = name
+        self.max_workers = max(1, max_workers)
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.active = 0
+        self.completed = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    async def run(self, fn, *args, **kwargs):
+        """Run fn(*args, **kwargs) on the pool and await its result."""
+        submitted = time.perf_counter()
+        with self._lock:
+            self.queued += 1
+
+        def task():
+            wait = time.perf_counter() - submitted
+            with self._lock:
+                self.queued -= 1
+                self.active += 1
+                self.total_wait += wait
+                self.max_wait = max(self.max_wait, wait)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self.active -= 1
+                    self.completed += 1
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, task)
+
+    def stats(self) -> dict:
+        """Return a snapshot of the pool metrics."""
+        with self._lock:
+            started = self.completed + self.active
+            return {
+                "workers": self.max_workers,
+                "queued": self.queued,
+                "active": self.active,
+                "completed": self.completed,
+                "avg_wait_ms": (self.total_wait / started * 1000) if started else 0.0,
+                "max_wait_ms": self.max_wait * 1000,
+            }
+
+    def shutdown(self) -> None:
+        """Stop accepting work and wait for running tasks."""
+        self._pool.shutdown(wait=True)
+
+
+io_executor = BoundedExecutor("ieee80211-io", IO_WORKERS)
+embed_executor = BoundedExecutor("ieee80211-embed", EMBED_WORKERS)
+
+
+def approx_size(obj) -> int:
+    """Rough memory footprint in bytes of a cached value."""
+    if hasattr(obj, "nbytes"):  # numpy arrays
+        return obj.nbytes
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(approx_size(k) + approx_size(v) for k, v in obj.items())
+    if isinstance(obj, (list, tuple)):
+        return sys.getsizeof(obj) + sum(approx_size(v) for v in obj)
+    return sys.getsizeof(obj)
+
+
+class LRUCache:
+    """Thread-safe LRU cache with an optional time-to-live and hit statistics."""
+
+    def __init__(self, name: str, max_entries: int, ttl: float = None):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (value, stored_at, size)
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Return the cached value, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl is not None and time.monotonic() - entry[1] > self.ttl:
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value) -> None:
+        if self.max_entries <= 0:
+            return
+        size = approx_size(value)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, time.monotonic(), size)
+            self.bytes += size
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key) -> None:
+        _, _, size = self._entries.pop(key)
+        self.bytes -= size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self) -> dict:
+        """Return a snapshot of the cache metrics."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "bytes": self.bytes,
+            }
+
+
+# Query embeddings keyed by normalized query text
+query_embedding_cache = LRUCache("query-embeddings", QUERY_CACHE_SIZE)
+# Search hits keyed by (index generation, query, filters, mode, n_results)
+result_cache = LRUCache("search-results", RESULT_CACHE_SIZE, ttl=RESULT_CACHE_TTL)
+
+
+def normalize_query(query: str) -> str:
+    """Normalize query text for cache keys.
+
+    all-MiniLM-L6-v2 is uncased and ignores extra whitespace, so these
+    variants embed identically.
+    """
+    return " ".join(query.lower().split())
+
+
+def embed_query(query: str) -> list:
+    """Embed a single query string with the shared model."""
+    return get_embedding_function()([query])
+
+
+async def vector_query(query: str, n_results: int, where: dict = None) -> dict:
+    """Run a semantic query, embedding and searching off the event loop."""
+    collection = await io_executor.run(get_collection)
+    key = normalize_query(query)
+    query_embeddings = query_embedding_cache.get(key)
+    if query_embeddings is None:
+        query_embeddings = await embed_executor.run(embed_query, key)
+        query_embedding_cache.put(key, query_embeddings)
+    return await io_executor.run(
+        collection.query,
+        query_embeddings=query_embeddings,
+        n_results=n_results,
+        where=where
+    )
+
+
+SEARCH_MODES = ("semantic", "hybrid")
+
+# Reciprocal rank fusion constant; 60 is the value from the original RRF paper
+RRF_K = 60
+# Each leg of a hybrid search fetches this many candidates per requested result
+HYBRID_CANDIDATES = 3
+# Sections are indexed as several passages; over-fetch so that collapsing
+# passages back to one hit per section still fills n_results
+PASSAGE_CANDIDATES = 3
+
+# "json" returns a compact JSON document instead of prose, for programmatic clients
+OUTPUT_FORMATS = ("text", "json")
+
+
+def to_json(payload) -> str:
+    """Serialize a structured tool result compactly."""
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+
+
+def records(columns: tuple, rows: list) -> list:
+    """Turn query rows into dicts keyed by column name."""
+    return [dict(zip(columns, row)) for row in rows]
+
+
+def invalid_output(output: str) -> str:
+    """Error message for an unknown output format, or None if it is valid."""
+    if output in OUTPUT_FORMATS:
+        return None
+    return f"Invalid output: {output}. Use one of: {', '.join(OUTPUT_FORMATS)}"
+
+
+def build_where(spec: str = None, content_type: str = None) -> dict:
+    """Build a ChromaDB metadata filter from the optional spec and type."""
+    clauses = []
+    if content_type:
+        clauses.append({"type": content_type})
+    if spec:
+        clauses.append({"spec": spec})
+    if not clauses:
+        return None
+    if len(clauses) == 1:
+        return clauses[0]
+    return {"$and": clauses}
+
+
+def hit_key(metadata: dict) -> tuple:
+    """Identity of a document shared by the ChromaDB and SQLite legs."""
+    content_type = metadata.get("type")
+    title = metadata.get("title") if content_type == "section" else metadata.get("caption")
+    return (content_type, metadata.get("spec"), title, metadata.get("page"))
+
+
+def keyword_row_to_hit(row: tuple) -> dict:
+    """Convert a keyword_rows() row into a search hit with ChromaDB-style metadata."""
+    kind, spec_id, number, title, page, snippet, score = row
+    metadata = {"type": kind, "spec": spec_id, "page": page}
+    metadata["title" if kind == "section" else "caption"] = title
+    return {"document": snippet, "metadata": metadata, "distance": None, "score": -score}
+
+
+async def semantic_hits(query: str, n_results: int, spec: str = None, content_type: str = None) -> list:
+    """Vector search returning hits ordered by embedding distance.
+
+    Passages of the same section are collapsed so each section appears
+    once, represented by its best-matching passage.
+    """
+    n_fetch = n_results if content_type in ("table", "figure") else n_results * PASSAGE_CANDIDATES
+    results = await vector_query(query, n_fetch, build_where(spec, content_type))
+
+    documents = results.get("documents", [[]])[0]
+    metadatas = results.get("metadatas", [[]])[0]
+    distances = results.get("distances", [[]])[0]
+
+    hits = {}
+    for doc, meta, dist in zip(documents, metadatas, distances):
+        # Results arrive best first, so the first passage seen wins
+        key = hit_key(meta)
+        if key not in hits:
+            hits[key] = {"document": doc, "metadata": meta, "distance": dist, "score": 1 - dist}
+            if len(hits) == n_results:
+                break
 
+    return list(hits.values())
 
-def format_result(doc: str, metadata: dict, distance: float) -> str:
+
+async def hybrid_hits(query: str, n_results: int, spec: str = None, content_type: str = None,
+                      semantic_weight: float = 1.0, keyword_weight: float = 1.0) -> list:
+    """Run vector and keyword search concurrently and fuse them with weighted RRF.
+
+    Each leg contributes weight / (RRF_K + rank) for every document it
+    returns. Documents found only by the keyword leg carry the matching
+    snippet as their content.
+    """
+    n_candidates = n_results * HYBRID_CANDIDATES
+    semantic, lexical = await asyncio.gather(
+        semantic_hits(query, n_candidates, spec, content_type),
+        # Any-word match: natural-language queries rarely have every word in one document
+        io_executor.run(keyword_rows, query, n_candidates, spec, content_type, True),
+        return_exceptions=True,
+    )
+    if isinstance(semantic, Exception):
+        raise semantic
+    if isinstance(lexical, Exception):
+        # The keyword leg needs the SQLite index; degrade to semantic results
+        logger.warning(f"Keyword leg of hybrid search failed: {lexical}")
+        lexical = []
+
+    fused = {}
+    for rank, hit in enumerate(semantic, start=1):
+        entry = fused.setdefault(hit_key(hit["metadata"]), dict(hit, score=0.0))
+        entry["score"] += semantic_weight / (RRF_K + rank)
+    for rank, row in enumerate(lexical, start=1):
+        hit = keyword_row_to_hit(row)
+        entry = fused.setdefault(hit_key(hit["metadata"]), dict(hit, score=0.0))
+        entry["score"] += keyword_weight / (RRF_K + rank)
+
+    return sorted(fused.values(), key=lambda h: h["score"], reverse=True)[:n_results]
+
+
+async def search_hits(query: str, n_results: int, spec: str = None, content_type: str = None,
+                      mode: str = "semantic", semantic_weight: float = 1.0,
+                      keyword_weight: float = 1.0) -> list:
+    """Dispatch a search to the requested retrieval mode, via the result cache.
+
+    Cached hits are shared between calls and must not be modified.
+    """
+    key = (runtime.index_version(), normalize_query(query), spec, content_type, mode, n_results)
+    if mode == "hybrid":
+        key += (semantic_weight, keyword_weight)
+    hits = result_cache.get(key)
+    if hits is not None:
+        return hits
+
+    if mode == "hybrid":
+        hits = await hybrid_hits(query, n_results, spec, content_type, semantic_weight, keyword_weight)
+    else:
+        hits = await semantic_hits(query, n_results, spec, content_type)
+    result_cache.put(key, hits)
+    return hits
+
+
+# Hits whose share of the budget is smaller than this show metadata only
+MIN_EXCERPT_CHARS = 200
+# Room reserved per trimmed hit for its elision note
+ELISION_NOTE_CHARS = 120
+ELLIPSIS = "..."
+TERM_RE = re.compile(r"[a-z0-9]+(?:[-.][a-z0-9]+)*")
+# Excerpts are built from sentences and lines (table rows)
+PIECE_BREAK_RE = re.compile(r"(?<=[.;!?])\s+|\n\s*")
+
+
+def query_terms(query: str) -> set:
+    """Lowercased words of a query, used to pick the passages of a hit worth showing."""
+    return {term for term in TERM_RE.findall(query.lower()) if len(term) > 1}
+
+
+def split_pieces(doc: str) -> list:
+    """Split a document into (start, end) spans of sentences and lines."""
+    spans = []
+    start = 0
+    for match in PIECE_BREAK_RE.finditer(doc):
+        if doc[start:match.start()].strip():
+            spans.append((start, match.start()))
+        start = match.end()
+    if doc[start:].strip():
+        spans.append((start, len(doc)))
+    return spans
+
+
+def best_excerpt(doc: str, terms: set, budget: int, keep_lead: int = 0) -> str:
+    """
+    Cut a document down to about `budget` characters.
+
+    Sentences and lines mentioning the most query terms are kept (earlier
+    ones first on ties), shown in document order with "..." marking the
+    gaps. A single piece longer than the budget is cut around its first
+    matching term.
+
+    Args:
+        doc: Document text
+        terms: Query terms, from query_terms()
+        budget: Target length in characters
+        keep_lead: Number of leading pieces to keep regardless of terms
+            (e.g. 2 for a markdown table's header and separator rows)
+    """
+    if len(doc) <= budget:
+        return doc
+    spans = split_pieces(doc)
+
+    def matches(span):
+        return sum(1 for term in TERM_RE.findall(doc[span[0]:span[1]].lower()) if term in terms)
+
+    lead = list(range(min(keep_lead, len(spans))))
+    ranked = lead + sorted(range(len(lead), len(spans)), key=lambda i: (-matches(spans[i]), i))
+    chosen = {}
+    used = 0
+    for i in ranked:
+        start, end = spans[i]
+        cost = end - start + len(ELLIPSIS) + 2
+        if used + cost > budget:
+            if chosen:
+                continue  # a shorter piece further down may still fit
+            width = budget - 2 * (len(ELLIPSIS) + 1)
+            piece = doc[start:end].lower()
+            first = min((piece.find(term) for term in terms if term in piece), default=0)
+            start = min(start + max(0, first - width // 4), end - width)
+            end = start + width
+            cost = budget
+        chosen[i] = (start, end)
+        used += cost
+
+    # Merge adjacent pieces back into runs of the original text
+    runs = []
+    previous = None
+    for i in sorted(chosen):
+        start, end = chosen[i]
+        if runs and previous == i - 1:
+            runs[-1][1] = end
+        else:
+            runs.append([start, end])
+        previous = i
+
+    def gap(start, end):
+        # Keep line structure (table rows) when the omitted text spans lines
+        return f"\n{ELLIPSIS}\n" if "\n" in doc[start:end] else f" {ELLIPSIS} "
+
+    text = doc[runs[0][0]:runs[0][1]].strip()
+    for (_, previous_end), (start, end) in zip(runs, runs[1:]):
+        text += gap(previous_end, start) + doc[start:end].strip()
+    if runs[0][0] > spans[0][0]:
+        text = gap(spans[0][0], runs[0][0]).lstrip() + text
+    if runs[-1][1] < spans[-1][1]:
+        text += gap(runs[-1][1], spans[-1][1]).rstrip()
+    return text
+
+
+def allocate_budget(sizes: list, weights: list, budget: int) -> list:
+    """
+    Split a character budget across documents in proportion to their weights.
+
+    A document never gets more than its own size; what it leaves unused is
+    shared out again among the rest.
+    """
+    allocation = [0] * len(sizes)
+    remaining = set(i for i, size in enumerate(sizes) if size > 0)
+    while remaining:
+        left = budget - sum(allocation)
+        total_weight = sum(weights[i] for i in remaining)
+        satisfied = [i for i in remaining if sizes[i] <= left * weights[i] / total_weight]
+        if not satisfied:
+            for i in remaining:
+                allocation[i] = int(left * weights[i] / total_weight)
+            break
+        for i in satisfied:
+            allocation[i] = sizes[i]
+            remaining.discard(i)
+    return allocation
+
+
+def full_text_hint(metadata: dict) -> str:
+    """The tool call that returns a hit's full content."""
+    content_type = metadata.get("type")
+    spec = metadata.get("spec")
+    spec_arg = f', spec="{spec}"' if spec else ""
+    if content_type == "section":
+        number = metadata.get("parent_section") or extract_section_number(metadata.get("title", ""))
+        return f'get_section("{number}"{spec_arg})' if number else "get_section"
+    if content_type == "table":
+        number = extract_table_number(metadata.get("caption", ""))
+        return f'get_table("{number}"{spec_arg})' if number else "get_table"
+    if content_type == "figure":
+        number = extract_figure_number(metadata.get("caption", ""))
+        return f'get_figure("{number}"{spec_arg})' if number else "get_figure"
+    return "get_section"
+
+
+def budget_hits(hits: list, query: str, max_chars: int, overhead: int) -> list:
+    """
+    Fit the documents of a list of hits into a reply of about max_chars.
+
+    The space left after headers and metadata (overhead) is shared by
+    score, so better hits keep more of their text. Documents that do not
+    fit are cut to their best-matching passages; hits whose share is too
+    small for a useful excerpt keep only their metadata.
+
+    Returns:
+        [(document, elided_chars)] in hit order
+    """
+    documents = [hit["document"] or "" for hit in hits]
+    sizes = [len(doc) for doc in documents]
+    if not max_chars or overhead + sum(sizes) <= max_chars:
+        return [(doc, 0) for doc in documents]
+
+    budget = max(0, max_chars - overhead - ELISION_NOTE_CHARS * (len(hits) + 1))
+    weights = [max(hit["score"] or 0.0, 1e-6) for hit in hits]
+    terms = query_terms(query)
+
+    budgeted = []
+    allocation = allocate_budget(sizes, weights, budget)
+    for hit, doc, size, allowance in zip(hits, documents, sizes, allocation):
+        if allowance >= size:
+            budgeted.append((doc, 0))
+        elif allowance < MIN_EXCERPT_CHARS:
+            budgeted.append(("", size))
+        else:
+            keep_lead = 2 if hit["metadata"].get("type") == "table" else 0
+            excerpt = best_excerpt(doc, terms, allowance, keep_lead)
+            budgeted.append((excerpt, size - len(excerpt)))
+    return budgeted
+
+
+def format_result(doc: str, metadata: dict, distance: float = None, score: float = None,
+                  elided: int = 0) -> str:
     """Format a single search result as a readable string."""
     content_type = metadata.get("type", "unknown")
     spec = metadata.get("spec", "")
     spec_label = f" [{spec}]" if spec else ""
-    lines = [f"[{content_type.upper()}]{spec_label} (relevance: {1 - distance:.2%})"]
+    if distance is not None:
+        lines = [f"[{content_type.upper()}]{spec_label} (relevance: {1 - distance:.2%})"]
+    else:
+        lines = [f"[{content_type.upper()}]{spec_label} (score: {score:.4f})"]
 
     if content_type == "section":
         lines.append(f"Title: {metadata.get('title', 'N/A')}")
         lines.append(f"Level: {metadata.get('level', 'N/A')}")
+        if metadata.get("chunk_count", 1) > 1:
+            lines.append(f"Passage: {metadata['chunk_index'] + 1} of {metadata['chunk_count']}"
+                         " (use get_section for the full text)")
     elif content_type == "table":
         lines.append(f"Caption: {metadata.get('caption', 'N/A')}")
     elif content_type == "figure":
@@ -63,51 +661,105 @@ def format_result(doc: str, metadata: dict, distance: float) -> str:
         lines.append(f"Spec: {metadata.get('spec_name', spec)}")
     lines.append(f"Page: {metadata.get('page', 'N/A')}")
     lines.append(f"Content:\n{doc}")
+    if elided:
+        lines.append(f"[{elided:,} of {len(doc) + elided:,} chars omitted; "
+                     f"{full_text_hint(metadata)} for the full text]")
 
     return "\n".join(lines)
 
 
+def format_hits(hits: list, label: str, mode: str = "semantic", query: str = "",
+                max_chars: int = 0) -> str:
+    """Format a list of search hits under numbered headers, within max_chars if given."""
+
+    def render(i, hit, doc, elided=0):
+        header = f"--- {label} {i + 1} ---"
+        if mode == "hybrid":
+            return f"{header}\n\n" + format_result(doc, hit["metadata"], score=hit["score"], elided=elided)
+        return f"{header}\n\n" + format_result(doc, hit["metadata"], hit["distance"], elided=elided)
+
+    overhead = sum(len(render(i, hit, "")) + 2 for i, hit in enumerate(hits))
+    budgeted = budget_hits(hits, query, max_chars, overhead)
+    formatted_results = [render(i, hit, doc, elided) for i, (hit, (doc, elided)) in enumerate(zip(hits, budgeted))]
+
+    trimmed = [elided for _, elided in budgeted if elided]
+    if trimmed:
+        formatted_results.append(f"--- Trimmed {len(trimmed)} of {len(hits)} results to fit max_chars={max_chars} "
+                                 f"({sum(trimmed):,} chars omitted) ---")
+
+    return "\n\n".join(formatted_results)
+
+
+def hit_record(hit: dict, doc: str, elided: int = 0, mode: str = "semantic") -> dict:
+    """One search hit as a JSON-ready dict."""
+    metadata = {key: value for key, value in hit["metadata"].items() if key != "meta_hash"}
+    if metadata.get("type") == "section" and "parent_section" in metadata:
+        # Passages record their own section number under parent_section
+        metadata["section_number"] = metadata.pop("parent_section")
+    record = {**metadata, "score": hit["score"]}
+    if mode != "hybrid":
+        record["distance"] = hit["distance"]
+    record["content"] = doc
+    if elided:
+        record["omitted_chars"] = elided
+        record["full_text"] = full_text_hint(hit["metadata"])
+    return record
+
+
+def hits_json(hits: list, mode: str = "semantic", query: str = "", max_chars: int = 0) -> str:
+    """Search hits as a JSON document, within max_chars like format_hits()."""
+    overhead = len(to_json({"query": query, "mode": mode, "omitted_chars": 0,
+                            "results": [hit_record(hit, "", 0, mode) for hit in hits]}))
+    budgeted = budget_hits(hits, query, max_chars, overhead)
+    return to_json({
+        "query": query,
+        "mode": mode,
+        "omitted_chars": sum(elided for _, elided in budgeted),
+        "results": [hit_record(hit, doc, elided, mode) for hit, (doc, elided) in zip(hits, budgeted)],
+    })
+
+
 @mcp.tool()
-async def search_ieee80211(query: str, n_results: int = 5, spec: str = None) -> str:
+async def search_ieee80211(query: str, n_results: int = 5, spec: str = None, mode: str = "semantic",
+                           semantic_weight: float = 1.0, keyword_weight: float = 1.0,
+                           max_chars: int = MAX_RESPONSE_CHARS, output: str = "text") -> str:
     """Search IEEE 802.11 specifications for relevant content.
 
     Performs semantic search across all sections, tables, and figures
-    in the indexed IEEE 802.11 specifications.
+    in the indexed IEEE 802.11 specifications. Use mode="hybrid" to also
+    run a keyword search and fuse both rankings, which helps with
+    acronym-heavy queries (e.g., "EHT-MCS", "NSTR", "TID-to-link").
 
     Args:
         query: The search query (e.g., "EMLSR padding delay", "Multi-Link element")
         n_results: Number of results to return (default: 5, max: 20)
         spec: Optional spec filter (e.g., "80211be", "80211bn"). If not provided, searches all specs.
+        mode: "semantic" (default) or "hybrid"
+        semantic_weight: Weight of the semantic ranking in hybrid mode (default: 1.0)
+        keyword_weight: Weight of the keyword ranking in hybrid mode (default: 1.0)
+        max_chars: Approximate size limit of the reply (default: 20000, 0 for no limit).
+            Long results are cut to their best-matching passages, with a note of
+            what was omitted and how to fetch it.
+        output: "text" (default) or "json" for a structured result
     """
-    logger.info(f"Searching for: {query}" + (f" in spec={spec}" if spec else ""))
+    logger.info(f"Searching for: {query}" + (f" in spec={spec}" if spec else "") + f" mode={mode}")
 
     n_results = min(max(1, n_results), 20)  # Clamp between 1 and 20
 
-    try:
-        collection = get_collection()
-
-        # Build where filter if spec is provided
-        where_filter = {"spec": spec} if spec else None
-
-        results = collection.query(
-            query_texts=[query],
-            n_results=n_results,
-            where=where_filter
-        )
+    if mode not in SEARCH_MODES:
+        return f"Invalid mode: {mode}. Use one of: {', '.join(SEARCH_MODES)}"
+    if invalid_output(output):
+        return invalid_output(output)
 
-        documents = results.get("documents", [[]])[0]
-        metadatas = results.get("metadatas", [[]])[0]
-        distances = results.get("distances", [[]])[0]
+    try:
+        hits = await search_hits(query, n_results, spec, None, mode, semantic_weight, keyword_weight)
 
-        if not documents:
+        if output == "json":
+            return hits_json(hits, mode, query, max_chars)
+        if not hits:
             return "No results found for your query."
 
-        formatted_results = []
-        for i, (doc, meta, dist) in enumerate(zip(documents, metadatas, distances)):
-            formatted_results.append(f"--- Result {i + 1} ---")
-            formatted_results.append(format_result(doc, meta, dist))
-
-        return "\n\n".join(formatted_results)
+        return format_hits(hits, "Result", mode, query, max_chars)
 
     except Exception as e:
         logger.error(f"Search error: {e}")
@@ -115,7 +767,9 @@ async def search_ieee80211(query: str, n_results: int = 5, spec: str = None) ->
 
 
 @mcp.tool()
-async def search_sections(query: str, n_results: int = 5, spec: str = None) -> str:
+async def search_sections(query: str, n_results: int = 5, spec: str = None, mode: str = "semantic",
+                          semantic_weight: float = 1.0, keyword_weight: float = 1.0,
+                          max_chars: int = MAX_RESPONSE_CHARS, output: str = "text") -> str:
     """Search only the specification sections (text content).
 
     Use this when looking for explanatory text, definitions, or procedures
@@ -125,39 +779,32 @@ async def search_sections(query: str, n_results: int = 5, spec: str = None) -> s
         query: The search query
         n_results: Number of results to return (default: 5, max: 20)
         spec: Optional spec filter (e.g., "80211be", "80211bn"). If not provided, searches all specs.
+        mode: "semantic" (default) or "hybrid" (semantic + keyword ranking)
+        semantic_weight: Weight of the semantic ranking in hybrid mode (default: 1.0)
+        keyword_weight: Weight of the keyword ranking in hybrid mode (default: 1.0)
+        max_chars: Approximate size limit of the reply (default: 20000, 0 for no limit).
+            Long results are cut to their best-matching passages, with a note of
+            what was omitted and how to fetch it.
+        output: "text" (default) or "json" for a structured result
     """
-    logger.info(f"Searching sections for: {query}" + (f" in spec={spec}" if spec else ""))
+    logger.info(f"Searching sections for: {query}" + (f" in spec={spec}" if spec else "") + f" mode={mode}")
 
     n_results = min(max(1, n_results), 20)
 
-    try:
-        collection = get_collection()
-
-        # Build where filter: type=section AND optionally spec
-        if spec:
-            where_filter = {"$and": [{"type": "section"}, {"spec": spec}]}
-        else:
-            where_filter = {"type": "section"}
+    if mode not in SEARCH_MODES:
+        return f"Invalid mode: {mode}. Use one of: {', '.join(SEARCH_MODES)}"
+    if invalid_output(output):
+        return invalid_output(output)
 
-        results = collection.query(
-            query_texts=[query],
-            n_results=n_results * 3,  # Get more to filter
-            where=where_filter
-        )
-
-        documents = results.get("documents", [[]])[0][:n_results]
-        metadatas = results.get("metadatas", [[]])[0][:n_results]
-        distances = results.get("distances", [[]])[0][:n_results]
+    try:
+        hits = await search_hits(query, n_results, spec, "section", mode, semantic_weight, keyword_weight)
 
-        if not documents:
+        if output == "json":
+            return hits_json(hits, mode, query, max_chars)
+        if not hits:
             return "No sections found for your query."
 
-        formatted_results = []
-        for i, (doc, meta, dist) in enumerate(zip(documents, metadatas, distances)):
-            formatted_results.append(f"--- Section {i + 1} ---")
-            formatted_results.append(format_result(doc, meta, dist))
-
-        return "\n\n".join(formatted_results)
+        return format_hits(hits, "Section", mode, query, max_chars)
 
     except Exception as e:
         logger.error(f"Search error: {e}")
@@ -165,7 +812,9 @@ async def search_sections(query: str, n_results: int = 5, spec: str = None) -> s
 
 
 @mcp.tool()
-async def search_tables(query: str, n_results: int = 5, spec: str = None) -> str:
+async def search_tables(query: str, n_results: int = 5, spec: str = None, mode: str = "semantic",
+                        semantic_weight: float = 1.0, keyword_weight: float = 1.0,
+                        max_chars: int = MAX_RESPONSE_CHARS, output: str = "text") -> str:
     """Search only the specification tables.
 
     Use this when looking for tabular data like encoding values,
@@ -175,39 +824,32 @@ async def search_tables(query: str, n_results: int = 5, spec: str = None) -> str
         query: The search query (e.g., "EMLSR padding delay encoding")
         n_results: Number of results to return (default: 5, max: 10)
         spec: Optional spec filter (e.g., "80211be", "80211bn"). If not provided, searches all specs.
+        mode: "semantic" (default) or "hybrid" (semantic + keyword ranking)
+        semantic_weight: Weight of the semantic ranking in hybrid mode (default: 1.0)
+        keyword_weight: Weight of the keyword ranking in hybrid mode (default: 1.0)
+        max_chars: Approximate size limit of the reply (default: 20000, 0 for no limit).
+            Long results are cut to their best-matching passages, with a note of
+            what was omitted and how to fetch it.
+        output: "text" (default) or "json" for a structured result
     """
-    logger.info(f"Searching tables for: {query}" + (f" in spec={spec}" if spec else ""))
+    logger.info(f"Searching tables for: {query}" + (f" in spec={spec}" if spec else "") + f" mode={mode}")
 
     n_results = min(max(1, n_results), 10)
 
-    try:
-        collection = get_collection()
-
-        # Build where filter: type=table AND optionally spec
-        if spec:
-            where_filter = {"$and": [{"type": "table"}, {"spec": spec}]}
-        else:
-            where_filter = {"type": "table"}
+    if mode not in SEARCH_MODES:
+        return f"Invalid mode: {mode}. Use one of: {', '.join(SEARCH_MODES)}"
+    if invalid_output(output):
+        return invalid_output(output)
 
-        results = collection.query(
-            query_texts=[query],
-            n_results=n_results * 2,
-            where=where_filter
-        )
-
-        documents = results.get("documents", [[]])[0][:n_results]
-        metadatas = results.get("metadatas", [[]])[0][:n_results]
-        distances = results.get("distances", [[]])[0][:n_results]
+    try:
+        hits = await search_hits(query, n_results, spec, "table", mode, semantic_weight, keyword_weight)
 
-        if not documents:
+        if output == "json":
+            return hits_json(hits, mode, query, max_chars)
+        if not hits:
             return "No tables found for your query."
 
-        formatted_results = []
-        for i, (doc, meta, dist) in enumerate(zip(documents, metadatas, distances)):
-            formatted_results.append(f"--- Table {i + 1} ---")
-            formatted_results.append(format_result(doc, meta, dist))
-
-        return "\n\n".join(formatted_results)
+        return format_hits(hits, "Table", mode, query, max_chars)
 
     except Exception as e:
         logger.error(f"Search error: {e}")
@@ -215,7 +857,9 @@ async def search_tables(query: str, n_results: int = 5, spec: str = None) -> str
 
 
 @mcp.tool()
-async def search_figures(query: str, n_results: int = 5, spec: str = None) -> str:
+async def search_figures(query: str, n_results: int = 5, spec: str = None, mode: str = "semantic",
+                         semantic_weight: float = 1.0, keyword_weight: float = 1.0,
+                         max_chars: int = MAX_RESPONSE_CHARS, output: str = "text") -> str:
     """Search only the specification figures.
 
     Use this when looking for diagrams, frame formats, or visual
@@ -226,86 +870,107 @@ async def search_figures(query: str, n_results: int = 5, spec: str = None) -> st
         query: The search query (e.g., "Multi-Link element format")
         n_results: Number of results to return (default: 5, max: 10)
         spec: Optional spec filter (e.g., "80211be", "80211bn"). If not provided, searches all specs.
+        mode: "semantic" (default) or "hybrid" (semantic + keyword ranking)
+        semantic_weight: Weight of the semantic ranking in hybrid mode (default: 1.0)
+        keyword_weight: Weight of the keyword ranking in hybrid mode (default: 1.0)
+        max_chars: Approximate size limit of the reply (default: 20000, 0 for no limit).
+            Long results are cut to their best-matching passages, with a note of
+            what was omitted and how to fetch it.
+        output: "text" (default) or "json" for a structured result
     """
-    logger.info(f"Searching figures for: {query}" + (f" in spec={spec}" if spec else ""))
+    logger.info(f"Searching figures for: {query}" + (f" in spec={spec}" if spec else "") + f" mode={mode}")
 
     n_results = min(max(1, n_results), 10)
 
-    try:
-        collection = get_collection()
+    if mode not in SEARCH_MODES:
+        return f"Invalid mode: {mode}. Use one of: {', '.join(SEARCH_MODES)}"
+    if invalid_output(output):
+        return invalid_output(output)
 
-        # Build where filter: type=figure AND optionally spec
-        if spec:
-            where_filter = {"$and": [{"type": "figure"}, {"spec": spec}]}
-        else:
-            where_filter = {"type": "figure"}
-
-        results = collection.query(
-            query_texts=[query],
-            n_results=n_results * 2,
-            where=where_filter
-        )
-
-        documents = results.get("documents", [[]])[0][:n_results]
-        metadatas = results.get("metadatas", [[]])[0][:n_results]
-        distances = results.get("distances", [[]])[0][:n_results]
+    try:
+        hits = await search_hits(query, n_results, spec, "figure", mode, semantic_weight, keyword_weight)
 
-        if not documents:
+        if output == "json":
+            return hits_json(hits, mode, query, max_chars)
+        if not hits:
             return "No figures found for your query."
 
-        formatted_results = []
-        for i, (doc, meta, dist) in enumerate(zip(documents, metadatas, distances)):
-            formatted_results.append(f"--- Figure {i + 1} ---")
-            formatted_results.append(format_result(doc, meta, dist))
-
-        return "\n\n".join(formatted_results)
+        return format_hits(hits, "Figure", mode, query, max_chars)
 
     except Exception as e:
         logger.error(f"Search error: {e}")
         return f"Error performing search: {str(e)}"
 
 
+async def load_index_counts(verify: bool) -> tuple:
+    """
+    Get per-spec entry counts for the stats tools.
+
+    Counts come from the manifest written by store_to_vectordb.py. With
+    verify, or when there is no manifest (or one from before passages were
+    counted), entries are also counted from the collection (metadata only,
+    paged).
+
+    Returns:
+        (counts, manifest, notes): counts per spec to report, the manifest
+        (or None), and lines describing any verification result
+    """
+    manifest = await io_executor.run(load_manifest, CHROMA_DB_PATH)
+    if manifest is not None and not has_passage_counts(manifest):
+        manifest = None
+        missing = "The index manifest predates passage counts"
+    else:
+        missing = "No index manifest found"
+    if manifest is not None and not verify:
+        return manifest["specs"], manifest, []
+
+    collection = await io_executor.run(get_collection)
+    counted = await io_executor.run(count_collection, collection)
+    if manifest is None:
+        return counted, None, [f"{missing}; counts were read from the collection.",
+                               "Re-run store_to_vectordb.py to write a current one."]
+
+    mismatches = []
+    for spec in sorted(set(manifest["specs"]) | set(counted)):
+        expected = manifest["specs"].get(spec, {})
+        actual = counted.get(spec, {})
+        for field in ENTRY_FIELDS:
+            if expected.get(field, 0) != actual.get(field, 0):
+                mismatches.append(f"  [{spec}] {field}: manifest {expected.get(field, 0)}, "
+                                  f"stored {actual.get(field, 0)}")
+    if mismatches:
+        return counted, manifest, ["Verification: manifest is out of date (showing stored counts):", *mismatches]
+    return counted, manifest, ["Verification: manifest matches the collection."]
+
+
 @mcp.tool()
-async def get_database_stats() -> str:
+async def get_database_stats(verify: bool = False) -> str:
     """Get statistics about the IEEE 802.11 database.
 
     Returns the count of sections, tables, and figures stored in the database,
-    broken down by specification.
+    broken down by specification. Counts come from the manifest written at
+    ingestion, so this is fast regardless of database size.
+
+    Args:
+        verify: Also count the entries in the collection and compare with the manifest (slower)
     """
-    logger.info("Getting database stats")
+    logger.info("Getting database stats" + (" (verify)" if verify else ""))
 
     try:
-        collection = get_collection()
-        all_docs = collection.get()
-
-        metadatas = all_docs.get("metadatas", [])
-
-        # Count by spec
-        spec_counts = {}
-        for m in metadatas:
-            spec = m.get("spec", "unknown")
-            spec_name = m.get("spec_name", spec)
-            if spec not in spec_counts:
-                spec_counts[spec] = {
-                    "spec_name": spec_name,
-                    "section": 0,
-                    "table": 0,
-                    "figure": 0
-                }
-            doc_type = m.get("type", "unknown")
-            if doc_type in spec_counts[spec]:
-                spec_counts[spec][doc_type] += 1
+        spec_counts, manifest, notes = await load_index_counts(verify)
 
         # Build output
         lines = ["IEEE 802.11 Database Statistics:", ""]
 
-        total_docs = len(metadatas)
         total_sections = sum(c["section"] for c in spec_counts.values())
+        total_passages = sum(c["passages"] for c in spec_counts.values())
         total_tables = sum(c["table"] for c in spec_counts.values())
         total_figures = sum(c["figure"] for c in spec_counts.values())
+        total_docs = total_sections + total_tables + total_figures
+        total_entries = sum(entry_count(c) for c in spec_counts.values())
 
-        lines.append(f"Total: {total_docs} documents")
-        lines.append(f"  - Sections: {total_sections}")
+        lines.append(f"Total: {total_docs} documents ({total_entries} index entries)")
+        lines.append(f"  - Sections: {total_sections} ({total_passages} passages)")
         lines.append(f"  - Tables: {total_tables}")
         lines.append(f"  - Figures: {total_figures}")
         lines.append("")
@@ -315,9 +980,15 @@ async def get_database_stats() -> str:
             for spec, counts in sorted(spec_counts.items()):
                 spec_total = counts["section"] + counts["table"] + counts["figure"]
                 lines.append(f"  [{spec}] {counts['spec_name']}: {spec_total} documents")
-                lines.append(f"    - Sections: {counts['section']}")
+                lines.append(f"    - Sections: {counts['section']} ({counts['passages']} passages)")
                 lines.append(f"    - Tables: {counts['table']}")
                 lines.append(f"    - Figures: {counts['figure']}")
+            lines.append("")
+
+        if manifest is not None:
+            lines.append(f"Index: generation {manifest['generation']}, model {manifest['model']}, "
+                         f"built {manifest['built_at']}")
+        lines.extend(notes)
 
         lines.append("")
         lines.append(f"ChromaDB path: {CHROMA_DB_PATH}")
@@ -330,43 +1001,50 @@ async def get_database_stats() -> str:
         return f"Error getting stats: {str(e)}"
 
 
+SPEC_COLUMNS = ("spec_id", "spec_name", "documents")
+
+
 @mcp.tool()
-async def list_specs() -> str:
+async def list_specs(verify: bool = False, output: str = "text") -> str:
     """List all available IEEE 802.11 specifications in the database.
 
     Returns a list of specification identifiers that can be used with the
     spec parameter in search tools.
+
+    Args:
+        verify: Count the entries in the collection instead of trusting the manifest (slower)
+        output: "text" (default) or "json" for a structured result
     """
-    logger.info("Listing available specs")
+    logger.info("Listing available specs" + (" (verify)" if verify else ""))
+
+    if invalid_output(output):
+        return invalid_output(output)
 
     try:
-        collection = get_collection()
-        all_docs = collection.get()
-
-        metadatas = all_docs.get("metadatas", [])
-
-        # Gather unique specs with counts
-        spec_info = {}
-        for m in metadatas:
-            spec = m.get("spec", "")
-            if spec:
-                if spec not in spec_info:
-                    spec_info[spec] = {
-                        "spec_name": m.get("spec_name", spec),
-                        "count": 0
-                    }
-                spec_info[spec]["count"] += 1
-
-        if not spec_info:
+        spec_counts, _, notes = await load_index_counts(verify)
+
+        rows = [
+            (spec, counts["spec_name"], sum(counts[t] for t in CONTENT_TYPES))
+            for spec, counts in sorted(spec_counts.items())
+            if spec != "unknown"
+        ]
+        rows = [row for row in rows if row[2]]
+
+        if output == "json":
+            return to_json({"specs": records(SPEC_COLUMNS, rows), "notes": notes})
+        if not rows:
             return "No specifications found in the database."
 
         lines = ["Available IEEE 802.11 Specifications:", ""]
-        for spec, info in sorted(spec_info.items()):
-            lines.append(f"  - {spec}: {info['spec_name']} ({info['count']} documents)")
+        for spec, spec_name, count in rows:
+            lines.append(f"  - {spec}: {spec_name} ({count} documents)")
 
         lines.append("")
         lines.append("Use the spec parameter in search tools to filter by specification.")
         lines.append('Example: search_ieee80211("EMLSR", spec="80211be")')
+        if notes:
+            lines.append("")
+            lines.extend(notes)
 
         return "\n".join(lines)
 
@@ -375,20 +1053,194 @@ async def list_specs() -> str:
         return f"Error listing specs: {str(e)}"
 
 
+@mcp.tool()
+async def reload_index() -> str:
+    """Reload the ChromaDB index after it has been rebuilt on disk.
+
+    Call this after running store_to_vectordb.py while the server is running.
+    """
+    logger.info("Reloading search index")
+
+    try:
+        generation = await io_executor.run(runtime.reload)
+        result_cache.clear()
+        collection = await io_executor.run(get_collection)
+        count = await io_executor.run(collection.count)
+        return f"Reloaded index '{COLLECTION_NAME}' (generation {generation}, {count} documents)"
+
+    except Exception as e:
+        logger.error(f"Reload error: {e}")
+        return f"Error reloading index: {str(e)}"
+
+
 # =============================================================================
 # SQLite Database Tools (Structured Queries)
 # =============================================================================
 
 
+class SQLitePool:
+    """Per-thread read-only SQLite connections shared by all SQLite tools.
+
+    Each worker thread opens one connection on first use and keeps it for
+    the life of the process, so lookups skip connection setup and can run
+    in parallel. Connections are opened with a mode=ro URI and tuned for
+    reads (mmap, larger page cache, statement cache).
+    """
+
+    MMAP_SIZE = 256 * 1024 * 1024
+    CACHE_SIZE_KB = 64 * 1024
+    CACHED_STATEMENTS = 256
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = []
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self.db_path.exists():
+            raise FileNotFoundError(f"SQLite database not found at {self.db_path}. Run store_to_db.py first.")
+        conn = sqlite3.connect(
+            f"file:{self.db_path}?mode=ro",
+            uri=True,
+            check_same_thread=False,  # only closed from another thread, at shutdown
+            cached_statements=self.CACHED_STATEMENTS,
+        )
+        conn.execute(f"PRAGMA mmap_size = {self.MMAP_SIZE}")
+        conn.execute(f"PRAGMA cache_size = -{self.CACHE_SIZE_KB}")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        conn.execute("PRAGMA query_only = ON")
+        return conn
+
+    def get(self) -> sqlite3.Connection:
+        """Get the calling thread's connection, opening it if needed."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def close_all(self) -> None:
+        """Close every connection opened by the pool."""
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+
+sqlite_pool = SQLitePool(SQLITE_DB_PATH)
+
+
 def get_sqlite_connection():
-    """Get a SQLite database connection."""
-    if not SQLITE_DB_PATH.exists():
-        raise FileNotFoundError(f"SQLite database not found at {SQLITE_DB_PATH}. Run store_to_db.py first.")
-    return sqlite3.connect(str(SQLITE_DB_PATH))
+    """Get the pooled read-only SQLite connection for this thread."""
+    return sqlite_pool.get()
+
+
+def fetch_all(query: str, params=()) -> list:
+    """Run a read query on the pooled connection and return all rows."""
+    return get_sqlite_connection().execute(query, params).fetchall()
+
+
+# Page size for list_sections / list_tables / list_figures
+DEFAULT_PAGE_SIZE = 200
+MAX_PAGE_SIZE = 1000
+
+
+def encode_cursor(state: dict) -> str:
+    """Pack pagination state into an opaque, URL-safe continuation token."""
+    raw = json.dumps(state, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    """Unpack a token from encode_cursor(); raises ValueError if it is malformed."""
+    try:
+        state = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except ValueError as e:
+        raise ValueError("Invalid cursor") from e
+    if (not isinstance(state, dict) or not isinstance(state.get("after"), list)
+            or not isinstance(state.get("total"), int) or not isinstance(state.get("offset"), int)):
+        raise ValueError("Invalid cursor")
+    return state
+
+
+def fetch_page(select: str, source: str, params: list, key_columns: tuple, filters: list,
+               limit: int, cursor: str = None) -> tuple:
+    """
+    Fetch one page of a listing with keyset pagination.
+
+    Each page starts strictly after the sort key of the previous page's last
+    row instead of using OFFSET, so every page is an index range scan of
+    `limit` rows no matter how deep into the listing it is, and rows are
+    neither skipped nor repeated. The total is counted once, on the first
+    page, and carried forward in the cursor.
+
+    Args:
+        select: Columns to return (e.g. "t.spec_id, t.caption")
+        source: FROM ... WHERE clause with all filters applied
+        params: Parameters for source
+        key_columns: Columns forming a unique sort key (e.g. ("t.spec_id", "t.sort_key", "t.id"))
+        filters: Filter values; a cursor is only accepted with the same filters
+        limit: Page size
+        cursor: Continuation token from the previous page, or None for the first page
+
+    Returns:
+        (rows, total, offset, next_cursor); next_cursor is None on the last page
+    """
+    conn = get_sqlite_connection()
+    keys = ", ".join(key_columns)
+    query = f"SELECT {select}, {keys} {source}"
+    page_params = list(params)
+
+    if cursor:
+        state = decode_cursor(cursor)
+        if state.get("filters") != filters or len(state["after"]) != len(key_columns):
+            raise ValueError("Cursor does not belong to this listing; repeat the original filters")
+        total, offset = state["total"], state["offset"]
+        query += f" AND ({keys}) > ({', '.join('?' * len(key_columns))})"
+        page_params += state["after"]
+    else:
+        total = conn.execute(f"SELECT COUNT(*) {source}", params).fetchone()[0]
+        offset = 0
+
+    query += f" ORDER BY {keys} LIMIT ?"
+    # One extra row tells whether another page follows
+    rows = conn.execute(query, page_params + [limit + 1]).fetchall()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor({
+            "filters": filters,
+            "after": list(rows[-1][-len(key_columns):]),
+            "total": total,
+            "offset": offset + limit,
+        })
+    return [row[:-len(key_columns)] for row in rows], total, offset, next_cursor
+
+
+def page_header(noun: str, count: int, total: int, offset: int) -> str:
+    """First line of a listing, with the position of this page when there is more than one."""
+    if offset == 0 and count == total:
+        return f"Found {total} {noun}:"
+    return f"Found {total} {noun} (showing {offset + 1}-{offset + count}):"
+
+
+def page_footer(next_cursor: str) -> list:
+    """Closing lines of a listing pointing to the next page, if any."""
+    if not next_cursor:
+        return []
+    return ["", f'More results: call again with cursor="{next_cursor}"']
+
+
+SECTION_COLUMNS = ("spec_id", "section_number", "section_title", "level", "page", "text")
 
 
 @mcp.tool()
-async def get_section(section_number: str, spec: str = None) -> str:
+async def get_section(section_number: str, spec: str = None, output: str = "text") -> str:
     """Get a specific section by its number.
 
     Performs exact lookup of a section by its number (e.g., "9.4.2.322.2").
@@ -396,29 +1248,29 @@ async def get_section(section_number: str, spec: str = None) -> str:
     Args:
         section_number: The section number to look up (e.g., "9.4.2.322.2")
         spec: Optional spec filter (e.g., "80211be"). If not provided, searches all specs.
+        output: "text" (default) or "json" for a structured result
     """
     logger.info(f"Getting section: {section_number}" + (f" from spec={spec}" if spec else ""))
 
-    try:
-        conn = get_sqlite_connection()
-        cursor = conn.cursor()
+    if invalid_output(output):
+        return invalid_output(output)
 
+    try:
         if spec:
-            cursor.execute("""
+            rows = await io_executor.run(fetch_all, """
                 SELECT spec_id, section_number, section_title, level, page, text
                 FROM sections
                 WHERE section_number = ? AND spec_id = ?
             """, (section_number, spec))
         else:
-            cursor.execute("""
+            rows = await io_executor.run(fetch_all, """
                 SELECT spec_id, section_number, section_title, level, page, text
                 FROM sections
                 WHERE section_number = ?
             """, (section_number,))
 
-        rows = cursor.fetchall()
-        conn.close()
-
+        if output == "json":
+            return to_json({"sections": records(SECTION_COLUMNS, rows)})
         if not rows:
             return f"No section found with number: {section_number}"
 
@@ -438,8 +1290,11 @@ async def get_section(section_number: str, spec: str = None) -> str:
         return f"Error getting section: {str(e)}"
 
 
+TABLE_COLUMNS = ("spec_id", "table_number", "caption", "page", "content_markdown", "section_number", "level")
+
+
 @mcp.tool()
-async def get_table(table_number: str, spec: str = None) -> str:
+async def get_table(table_number: str, spec: str = None, output: str = "text") -> str:
     """Get a specific table by its number.
 
     Performs exact lookup of a table by its number (e.g., "9-417g").
@@ -447,29 +1302,29 @@ async def get_table(table_number: str, spec: str = None) -> str:
     Args:
         table_number: The table number to look up (e.g., "9-417g")
         spec: Optional spec filter (e.g., "80211be"). If not provided, searches all specs.
+        output: "text" (default) or "json" for a structured result
     """
     logger.info(f"Getting table: {table_number}" + (f" from spec={spec}" if spec else ""))
 
-    try:
-        conn = get_sqlite_connection()
-        cursor = conn.cursor()
+    if invalid_output(output):
+        return invalid_output(output)
 
+    try:
         if spec:
-            cursor.execute("""
+            rows = await io_executor.run(fetch_all, """
                 SELECT spec_id, table_number, caption, page, content_markdown, section_number, level
                 FROM tables
                 WHERE table_number = ? AND spec_id = ?
             """, (table_number, spec))
         else:
-            cursor.execute("""
+            rows = await io_executor.run(fetch_all, """
                 SELECT spec_id, table_number, caption, page, content_markdown, section_number, level
                 FROM tables
                 WHERE table_number = ?
             """, (table_number,))
 
-        rows = cursor.fetchall()
-        conn.close()
-
+        if output == "json":
+            return to_json({"tables": records(TABLE_COLUMNS, rows)})
         if not rows:
             return f"No table found with number: {table_number}"
 
@@ -489,8 +1344,12 @@ async def get_table(table_number: str, spec: str = None) -> str:
         return f"Error getting table: {str(e)}"
 
 
+FIGURE_COLUMNS = ("spec_id", "figure_number", "caption", "page", "image_path", "section_number", "level",
+                  "image_format", "image_width", "image_height", "image_bytes")
+
+
 @mcp.tool()
-async def get_figure(figure_number: str, spec: str = None) -> str:
+async def get_figure(figure_number: str, spec: str = None, output: str = "text") -> str:
     """Get a specific figure by its number.
 
     Performs exact lookup of a figure by its number (e.g., "9-1074o").
@@ -498,39 +1357,44 @@ async def get_figure(figure_number: str, spec: str = None) -> str:
     Args:
         figure_number: The figure number to look up (e.g., "9-1074o")
         spec: Optional spec filter (e.g., "80211be"). If not provided, searches all specs.
+        output: "text" (default) or "json" for a structured result
     """
     logger.info(f"Getting figure: {figure_number}" + (f" from spec={spec}" if spec else ""))
 
-    try:
-        conn = get_sqlite_connection()
-        cursor = conn.cursor()
+    if invalid_output(output):
+        return invalid_output(output)
 
+    try:
         if spec:
-            cursor.execute("""
-                SELECT spec_id, figure_number, caption, page, image_path, section_number, level
+            rows = await io_executor.run(fetch_all, """
+                SELECT spec_id, figure_number, caption, page, image_path, section_number, level,
+                       image_format, image_width, image_height, image_bytes
                 FROM figures
                 WHERE figure_number = ? AND spec_id = ?
             """, (figure_number, spec))
         else:
-            cursor.execute("""
-                SELECT spec_id, figure_number, caption, page, image_path, section_number, level
+            rows = await io_executor.run(fetch_all, """
+                SELECT spec_id, figure_number, caption, page, image_path, section_number, level,
+                       image_format, image_width, image_height, image_bytes
                 FROM figures
                 WHERE figure_number = ?
             """, (figure_number,))
 
-        rows = cursor.fetchall()
-        conn.close()
-
+        if output == "json":
+            return to_json({"figures": records(FIGURE_COLUMNS, rows)})
         if not rows:
             return f"No figure found with number: {figure_number}"
 
         results = []
         for row in rows:
-            spec_id, fig_num, caption, page, image_path, section_num, level = row
+            spec_id, fig_num, caption, page, image_path, section_num, level, fmt, width, height, size = row
             results.append(f"[{spec_id}] Figure {fig_num}")
             results.append(f"Caption: {caption}")
             results.append(f"Page: {page}, Section: {section_num or 'N/A'}, Level: {level or 'N/A'}")
             results.append(f"Image path: {image_path or 'N/A'}")
+            if fmt:
+                dimensions = f"{width}x{height} " if width and height else ""
+                results.append(f"Image: {dimensions}{fmt.upper()}, {size} bytes (use get_figure_image to view)")
             results.append("")
 
         return "\n".join(results)
@@ -540,22 +1404,77 @@ async def get_figure(figure_number: str, spec: str = None) -> str:
         return f"Error getting figure: {str(e)}"
 
 
+def read_blob(image_hash: str, image_format: str) -> bytes:
+    """Read a figure image from the content-addressed blob store."""
+    return BlobStore(BLOB_DIR).get(image_hash, image_format)
+
+
 @mcp.tool()
-async def list_sections(spec: str = None, level: int = None, page: int = None) -> str:
+async def get_figure_image(figure_number: str, spec: str = None) -> Image | str:
+    """Get the image of a specific figure.
+
+    Returns the figure image itself so it can be viewed. Use get_figure or
+    list_figures first to find the figure number.
+
+    Args:
+        figure_number: The figure number to look up (e.g., "9-1074o")
+        spec: Optional spec filter (e.g., "80211be"). If several specs have this figure, the first is returned.
+    """
+    logger.info(f"Getting figure image: {figure_number}" + (f" from spec={spec}" if spec else ""))
+
+    try:
+        query = "SELECT image_hash, image_format FROM figures WHERE figure_number = ?"
+        params = [figure_number]
+        if spec:
+            query += " AND spec_id = ?"
+            params.append(spec)
+        query += " ORDER BY spec_id LIMIT 1"
+
+        rows = await io_executor.run(fetch_all, query, params)
+        if not rows:
+            return f"No figure found with number: {figure_number}"
+
+        image_hash, image_format = rows[0]
+        if not image_hash:
+            return f"Figure {figure_number} has no stored image."
+
+        data = await io_executor.run(read_blob, image_hash, image_format)
+        return Image(data=data, format=image_format)
+
+    except FileNotFoundError:
+        return f"Image for figure {figure_number} is missing from {BLOB_DIR}. Re-run store_to_db.py."
+    except Exception as e:
+        logger.error(f"Get figure image error: {e}")
+        return f"Error getting figure image: {str(e)}"
+
+
+LIST_SECTION_COLUMNS = ("spec_id", "section_number", "section_title", "level", "page")
+
+
+@mcp.tool()
+async def list_sections(spec: str = None, level: int = None, page: int = None,
+                        limit: int = DEFAULT_PAGE_SIZE, cursor: str = None,
+                        output: str = "text") -> str:
     """List all sections, optionally filtered by spec, level, or page.
 
+    Results are paginated: when more sections match than fit in one page, the
+    reply ends with a cursor to pass back (with the same filters) for the next page.
+
     Args:
         spec: Optional spec filter (e.g., "80211be")
         level: Optional level filter (e.g., 5 for top-level sections)
         page: Optional page filter
+        limit: Maximum sections per page (default: 200, max: 1000)
+        cursor: Continuation token from the previous page
+        output: "text" (default) or "json" for a structured result
     """
     logger.info(f"Listing sections" + (f" spec={spec}" if spec else "") + (f" level={level}" if level else ""))
 
-    try:
-        conn = get_sqlite_connection()
-        cursor = conn.cursor()
+    if invalid_output(output):
+        return invalid_output(output)
 
-        query = "SELECT spec_id, section_number, section_title, level, page FROM sections WHERE 1=1"
+    try:
+        query = "FROM sections WHERE 1=1"
         params = []
 
         if spec:
@@ -568,20 +1487,24 @@ async def list_sections(spec: str = None, level: int = None, page: int = None) -
             query += " AND page = ?"
             params.append(page)
 
-        query += " ORDER BY spec_id, section_number"
-
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
-        conn.close()
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        rows, total, offset, next_cursor = await io_executor.run(
+            fetch_page, "spec_id, section_number, section_title, level, page", query, params,
+            ("spec_id", "sort_key", "id"), [spec, level, page], limit, cursor,
+        )
 
+        if output == "json":
+            return to_json({"total": total, "offset": offset, "next_cursor": next_cursor,
+                            "sections": records(LIST_SECTION_COLUMNS, rows)})
         if not rows:
             return "No sections found matching the criteria."
 
-        results = [f"Found {len(rows)} sections:", ""]
+        results = [page_header("sections", len(rows), total, offset), ""]
         for row in rows:
             spec_id, sec_num, title, lvl, pg = row
             indent = "  " * (lvl - 1) if lvl else ""
             results.append(f"[{spec_id}] {indent}{sec_num} {title} (p.{pg})")
+        results.extend(page_footer(next_cursor))
 
         return "\n".join(results)
 
@@ -590,43 +1513,63 @@ async def list_sections(spec: str = None, level: int = None, page: int = None) -
         return f"Error listing sections: {str(e)}"
 
 
+LIST_TABLE_COLUMNS = ("spec_id", "table_number", "caption", "page", "section_number")
+
+
 @mcp.tool()
-async def list_tables(spec: str = None, section_number: str = None) -> str:
+async def list_tables(spec: str = None, section_number: str = None,
+                      limit: int = DEFAULT_PAGE_SIZE, cursor: str = None,
+                      output: str = "text") -> str:
     """List all tables, optionally filtered by spec or section.
 
+    Results are paginated: when more tables match than fit in one page, the
+    reply ends with a cursor to pass back (with the same filters) for the next page.
+
     Args:
         spec: Optional spec filter (e.g., "80211be")
         section_number: Optional section filter (e.g., "9.4.2" for all tables in that section)
+        limit: Maximum tables per page (default: 200, max: 1000)
+        cursor: Continuation token from the previous page
+        output: "text" (default) or "json" for a structured result
     """
     logger.info(f"Listing tables" + (f" spec={spec}" if spec else "") + (f" section={section_number}" if section_number else ""))
 
-    try:
-        conn = get_sqlite_connection()
-        cursor = conn.cursor()
+    if invalid_output(output):
+        return invalid_output(output)
 
-        query = "SELECT spec_id, table_number, caption, page, section_number FROM tables WHERE 1=1"
+    try:
+        query = "FROM tables t"
         params = []
 
+        if section_number:
+            # Section and all its subsections, via the ancestor closure
+            query += """
+                JOIN section_ancestors a
+                  ON a.ancestor = ? AND a.spec_id = t.spec_id AND a.descendant = t.section_number
+            """
+            params.append(section_number)
+        query += " WHERE 1=1"
         if spec:
-            query += " AND spec_id = ?"
+            query += " AND t.spec_id = ?"
             params.append(spec)
-        if section_number:
-            query += " AND section_number LIKE ?"
-            params.append(f"{section_number}%")
-
-        query += " ORDER BY spec_id, table_number"
 
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
-        conn.close()
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        rows, total, offset, next_cursor = await io_executor.run(
+            fetch_page, "t.spec_id, t.table_number, t.caption, t.page, t.section_number", query, params,
+            ("t.spec_id", "t.table_number", "t.id"), [spec, section_number], limit, cursor,
+        )
 
+        if output == "json":
+            return to_json({"total": total, "offset": offset, "next_cursor": next_cursor,
+                            "tables": records(LIST_TABLE_COLUMNS, rows)})
         if not rows:
             return "No tables found matching the criteria."
 
-        results = [f"Found {len(rows)} tables:", ""]
+        results = [page_header("tables", len(rows), total, offset), ""]
         for row in rows:
             spec_id, tbl_num, caption, page, sec_num = row
             results.append(f"[{spec_id}] Table {tbl_num}: {caption} (p.{page}, sec.{sec_num or 'N/A'})")
+        results.extend(page_footer(next_cursor))
 
         return "\n".join(results)
 
@@ -635,43 +1578,63 @@ async def list_tables(spec: str = None, section_number: str = None) -> str:
         return f"Error listing tables: {str(e)}"
 
 
+LIST_FIGURE_COLUMNS = ("spec_id", "figure_number", "caption", "page", "section_number", "image_path")
+
+
 @mcp.tool()
-async def list_figures(spec: str = None, section_number: str = None) -> str:
+async def list_figures(spec: str = None, section_number: str = None,
+                       limit: int = DEFAULT_PAGE_SIZE, cursor: str = None,
+                       output: str = "text") -> str:
     """List all figures, optionally filtered by spec or section.
 
+    Results are paginated: when more figures match than fit in one page, the
+    reply ends with a cursor to pass back (with the same filters) for the next page.
+
     Args:
         spec: Optional spec filter (e.g., "80211be")
         section_number: Optional section filter (e.g., "9.4.2" for all figures in that section)
+        limit: Maximum figures per page (default: 200, max: 1000)
+        cursor: Continuation token from the previous page
+        output: "text" (default) or "json" for a structured result
     """
     logger.info(f"Listing figures" + (f" spec={spec}" if spec else "") + (f" section={section_number}" if section_number else ""))
 
-    try:
-        conn = get_sqlite_connection()
-        cursor = conn.cursor()
+    if invalid_output(output):
+        return invalid_output(output)
 
-        query = "SELECT spec_id, figure_number, caption, page, section_number, image_path FROM figures WHERE 1=1"
+    try:
+        query = "FROM figures t"
         params = []
 
+        if section_number:
+            # Section and all its subsections, via the ancestor closure
+            query += """
+                JOIN section_ancestors a
+                  ON a.ancestor = ? AND a.spec_id = t.spec_id AND a.descendant = t.section_number
+            """
+            params.append(section_number)
+        query += " WHERE 1=1"
         if spec:
-            query += " AND spec_id = ?"
+            query += " AND t.spec_id = ?"
             params.append(spec)
-        if section_number:
-            query += " AND section_number LIKE ?"
-            params.append(f"{section_number}%")
-
-        query += " ORDER BY spec_id, figure_number"
 
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
-        conn.close()
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        rows, total, offset, next_cursor = await io_executor.run(
+            fetch_page, "t.spec_id, t.figure_number, t.caption, t.page, t.section_number, t.image_path", query, params,
+            ("t.spec_id", "t.figure_number", "t.id"), [spec, section_number], limit, cursor,
+        )
 
+        if output == "json":
+            return to_json({"total": total, "offset": offset, "next_cursor": next_cursor,
+                            "figures": records(LIST_FIGURE_COLUMNS, rows)})
         if not rows:
             return "No figures found matching the criteria."
 
-        results = [f"Found {len(rows)} figures:", ""]
+        results = [page_header("figures", len(rows), total, offset), ""]
         for row in rows:
             spec_id, fig_num, caption, page, sec_num, img_path = row
             results.append(f"[{spec_id}] Figure {fig_num}: {caption} (p.{page}, sec.{sec_num or 'N/A'})")
+        results.extend(page_footer(next_cursor))
 
         return "\n".join(results)
 
@@ -680,8 +1643,12 @@ async def list_figures(spec: str = None, section_number: str = None) -> str:
         return f"Error listing figures: {str(e)}"
 
 
+TITLE_COLUMNS = ("spec_id", "section_number", "section_title", "page")
+
+
 @mcp.tool()
-async def get_section_titles_by_level(level: int, parent_section: str = None, spec: str = None) -> str:
+async def get_section_titles_by_level(level: int, parent_section: str = None, spec: str = None,
+                                      output: str = "text") -> str:
     """Get section titles at a specific hierarchy level.
 
     Browse the section hierarchy by level. Optionally filter by parent section
@@ -692,6 +1659,7 @@ async def get_section_titles_by_level(level: int, parent_section: str = None, sp
         parent_section: Optional parent section number to filter subsections
                        (e.g., "9" for all sections under 9.x, "9.4" for 9.4.x)
         spec: Optional spec filter (e.g., "80211be")
+        output: "text" (default) or "json" for a structured result
 
     Examples:
         - get_section_titles_by_level(1) -> All top-level sections
@@ -702,28 +1670,34 @@ async def get_section_titles_by_level(level: int, parent_section: str = None, sp
                 (f" under {parent_section}" if parent_section else "") +
                 (f" in spec={spec}" if spec else ""))
 
-    try:
-        conn = get_sqlite_connection()
-        cursor = conn.cursor()
+    if invalid_output(output):
+        return invalid_output(output)
 
-        query = "SELECT spec_id, section_number, section_title, page FROM sections WHERE level = ?"
-        params = [level]
+    try:
+        query = "SELECT s.spec_id, s.section_number, s.section_title, s.page FROM sections s"
+        params = []
 
         if parent_section:
-            # Filter by parent section prefix
-            query += " AND section_number LIKE ?"
-            params.append(f"{parent_section}.%")
-
+            # Descendants of the parent section, via the ancestor closure
+            query += """
+                JOIN section_ancestors a
+                  ON a.ancestor = ? AND a.depth > 0 AND a.spec_id = s.spec_id AND a.descendant = s.section_number
+            """
+            params.append(parent_section)
+
+        query += " WHERE s.level = ?"
+        params.append(level)
         if spec:
-            query += " AND spec_id = ?"
+            query += " AND s.spec_id = ?"
             params.append(spec)
 
-        query += " ORDER BY spec_id, section_number"
+        query += " ORDER BY s.spec_id, s.sort_key"
 
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
-        conn.close()
+        rows = await io_executor.run(fetch_all, query, params)
 
+        if output == "json":
+            return to_json({"level": level, "parent_section": parent_section,
+                            "sections": records(TITLE_COLUMNS, rows)})
         if not rows:
             msg = f"No sections found at level {level}"
             if parent_section:
@@ -752,6 +1726,28 @@ async def get_section_titles_by_level(level: int, parent_section: str = None, sp
         return f"Error getting section titles: {str(e)}"
 
 
+def level_stats_fallback(conn: sqlite3.Connection, spec: str = None) -> list:
+    """Compute level_stats rows from the sections table, for databases built before it existed."""
+    where = " WHERE spec_id = ?" if spec else ""
+    params = [spec] if spec else []
+    samples = {}
+    for spec_id, level, number, title in conn.execute(f"""
+        SELECT spec_id, level, section_number, section_title FROM (
+            SELECT spec_id, level, section_number, section_title,
+                   ROW_NUMBER() OVER (PARTITION BY spec_id, level ORDER BY sort_key, id) AS position
+            FROM sections{where}
+        ) WHERE position <= 3
+    """, params):
+        samples.setdefault((spec_id, level), []).append([number, title])
+    return [
+        (spec_id, level, count, json.dumps(samples.get((spec_id, level), [])))
+        for spec_id, level, count in conn.execute(
+            f"SELECT spec_id, level, COUNT(*) FROM sections{where} GROUP BY level, spec_id ORDER BY level, spec_id",
+            params
+        )
+    ]
+
+
 @mcp.tool()
 async def browse_section_hierarchy(spec: str = None) -> str:
     """Get an overview of the section hierarchy showing all levels.
@@ -764,45 +1760,44 @@ async def browse_section_hierarchy(spec: str = None) -> str:
     """
     logger.info(f"Browsing section hierarchy" + (f" for spec={spec}" if spec else ""))
 
-    try:
+    def build() -> list:
         conn = get_sqlite_connection()
-        cursor = conn.cursor()
 
-        # Get counts by level
-        query = "SELECT level, COUNT(*) FROM sections"
+        # Counts and samples per (spec, level), maintained by store_to_db.py
+        query = "SELECT spec_id, level, sections, samples FROM level_stats"
         params = []
         if spec:
             query += " WHERE spec_id = ?"
             params.append(spec)
-        query += " GROUP BY level ORDER BY level"
+        query += " ORDER BY level, spec_id"
+        try:
+            rows = conn.execute(query, params).fetchall()
+        except sqlite3.OperationalError:
+            rows = level_stats_fallback(conn, spec)
+
+        levels = {}
+        for spec_id, level, count, samples in rows:
+            entry = levels.setdefault(level, {"count": 0, "samples": []})
+            entry["count"] += count
+            entry["samples"].extend(json.loads(samples or "[]"))
 
-        cursor.execute(query, params)
-        level_counts = cursor.fetchall()
-
-        # Get sample sections at each level
         results = ["Section Hierarchy Overview:", ""]
-
-        for level, count in level_counts:
+        for level, entry in levels.items():
+            count = entry["count"]
             results.append(f"Level {level}: {count} sections")
 
-            # Get a few samples at this level
-            sample_query = "SELECT section_number, section_title FROM sections WHERE level = ?"
-            sample_params = [level]
-            if spec:
-                sample_query += " AND spec_id = ?"
-                sample_params.append(spec)
-            sample_query += " LIMIT 3"
-
-            cursor.execute(sample_query, sample_params)
-            samples = cursor.fetchall()
+            samples = entry["samples"][:3]
             for sec_num, title in samples:
                 title_short = title[:60] + "..." if len(title) > 60 else title
                 results.append(f"  - {sec_num}: {title_short}")
-            if count > 3:
-                results.append(f"  ... and {count - 3} more")
+            if count > len(samples):
+                results.append(f"  ... and {count - len(samples)} more")
             results.append("")
 
-        conn.close()
+        return results
+
+    try:
+        results = await io_executor.run(build)
 
         results.append("Use get_section_titles_by_level(level, parent_section) to drill down.")
 
@@ -813,6 +1808,196 @@ async def browse_section_hierarchy(spec: str = None) -> str:
         return f"Error browsing hierarchy: {str(e)}"
 
 
+class SectionTree:
+    """In-memory section hierarchy of every spec, built from SQLite once and reused.
+
+    Sections are read in sort_key order and linked to their nearest stored
+    ancestor, with child and descendant counts and page spans precomputed,
+    so any subtree can be rendered in time proportional to its size. The
+    tree is rebuilt when store_to_db.py reloads a spec (detected from the
+    extraction timestamps in the specifications table).
+    """
+
+    SIGNATURE_QUERY = "SELECT group_concat(spec_id || '@' || extracted_at, ',') FROM specifications"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._signature = None
+        self.roots = {}  # spec_id -> top-level nodes
+        self.nodes = {}  # (spec_id, section_number) -> node
+        self.build_seconds = 0.0
+
+    def get(self) -> "SectionTree":
+        """Return the tree, (re)building it if the database has been reloaded."""
+        conn = get_sqlite_connection()
+        signature = conn.execute(self.SIGNATURE_QUERY).fetchone()[0]
+        if signature != self._signature:
+            with self._lock:
+                if signature != self._signature:
+                    self._build(conn)
+                    self._signature = signature
+        return self
+
+    def _build(self, conn: sqlite3.Connection) -> None:
+        started = time.perf_counter()
+        rows = conn.execute("""
+            SELECT spec_id, section_number, section_title, level, page
+            FROM sections
+            WHERE section_number != ''
+            ORDER BY spec_id, sort_key, id
+        """).fetchall()
+
+        roots = {}
+        nodes = {}
+        ordered = []
+        stack = []
+        for spec_id, number, title, level, page in rows:
+            # Pop until the top of the stack is an ancestor in the same spec
+            while stack and not (stack[-1]["spec"] == spec_id and number.startswith(stack[-1]["number"] + ".")):
+                stack.pop()
+            parent = stack[-1] if stack else None
+            node = {
+                "spec": spec_id,
+                "number": number,
+                "title": title,
+                "level": level,
+                "page": page,
+                "end_page": page,
+                "parent": parent,
+                "children": [],
+                "descendants": 0,
+            }
+            if parent:
+                parent["children"].append(node)
+            else:
+                roots.setdefault(spec_id, []).append(node)
+            nodes.setdefault((spec_id, number), node)
+            ordered.append(node)
+            stack.append(node)
+
+        # Descendant counts, bottom-up (a parent always precedes its descendants)
+        for node in reversed(ordered):
+            if node["parent"]:
+                node["parent"]["descendants"] += node["descendants"] + 1
+
+        # A subtree is a contiguous run in sort order; it ends where the next
+        # section of the same spec begins, or at its last section's page
+        for i, node in enumerate(ordered):
+            last = i + node["descendants"]
+            pages = [n["page"] for n in ordered[i:last + 1] if n["page"] is not None]
+            end_page = max(pages) if pages else None
+            following = ordered[last + 1] if last + 1 < len(ordered) else None
+            if following and following["spec"] == node["spec"] and following["page"] is not None:
+                end_page = max(end_page or 0, following["page"])
+            node["end_page"] = end_page
+
+        self.roots = roots
+        self.nodes = nodes
+        self.build_seconds = time.perf_counter() - started
+        logger.info(f"Built section tree: {len(ordered)} sections in {self.build_seconds:.2f}s")
+
+
+section_tree = SectionTree()
+
+
+def format_tree_node(node: dict) -> str:
+    """One line of get_section_tree output: number, title, page span and counts."""
+    title = node["title"]
+    if title.startswith(node["number"]):
+        title = title[len(node["number"]):].strip()
+    start, end = node["page"], node["end_page"]
+    pages = f"p.{start}" if start == end else f"pp.{start}-{end}"
+    line = f"{node['number']} {title} ({pages}"
+    if node["children"]:
+        children = len(node["children"])
+        line += f", {children} {'child' if children == 1 else 'children'}, {node['descendants']} subsections"
+    return line + ")"
+
+
+# One row per node shown; "depth" is relative to the first level shown and
+# "collapsed" marks nodes whose children are beyond the requested depth
+TREE_COLUMNS = ("spec_id", "section_number", "section_title", "level", "page", "end_page",
+                "depth", "children", "descendants", "collapsed")
+
+
+@mcp.tool()
+async def get_section_tree(root: str = None, depth: int = 2, spec: str = None,
+                           output: str = "text") -> str:
+    """Get the section tree under a section, with child counts and page spans.
+
+    Navigate the spec structure one subtree at a time: start without a root
+    to see the top-level sections, then pass a section number as root to
+    expand it. Sections whose children are beyond the requested depth are
+    marked with the number of children left to expand.
+
+    Args:
+        root: Section number to expand (e.g., "9.4.2"). If not provided, starts from the top-level sections.
+        depth: Number of levels below the root to show (1-6, default: 2)
+        spec: Optional spec filter (e.g., "80211be"). If not provided, shows all specs.
+        output: "text" (default) or "json" for a structured result
+    """
+    logger.info(f"Getting section tree" + (f" under {root}" if root else "") +
+                f" depth={depth}" + (f" spec={spec}" if spec else ""))
+
+    if invalid_output(output):
+        return invalid_output(output)
+
+    depth = max(1, min(depth, 6))
+
+    try:
+        tree = await io_executor.run(section_tree.get)
+
+        specs = [spec] if spec else sorted(tree.roots)
+        results = []
+        rows = []
+        collapsed = False
+        for spec_id in specs:
+            if root:
+                node = tree.nodes.get((spec_id, root))
+                if node is None:
+                    continue
+                tops = [node]
+                results.append(f"[{spec_id}] Section tree under {root}:")
+            else:
+                tops = tree.roots.get(spec_id, [])
+                if not tops:
+                    continue
+                results.append(f"[{spec_id}] Top-level sections ({len(tops)}):")
+
+            # Depth-first, visiting only nodes within the requested depth
+            # (a root is shown above its `depth` levels; top-level sections count as the first level)
+            max_depth = depth if root else depth - 1
+            stack = [(node, 0) for node in reversed(tops)]
+            while stack:
+                node, node_depth = stack.pop()
+                line = "  " * (node_depth + 1) + format_tree_node(node)
+                folded = node_depth >= max_depth and bool(node["children"])
+                if not folded:
+                    stack.extend((child, node_depth + 1) for child in reversed(node["children"]))
+                else:
+                    line += " [+]"
+                    collapsed = True
+                results.append(line)
+                rows.append((spec_id, node["number"], node["title"], node["level"], node["page"],
+                             node["end_page"], node_depth, len(node["children"]), node["descendants"], folded))
+            results.append("")
+
+        if output == "json":
+            return to_json({"root": root, "depth": depth, "sections": records(TREE_COLUMNS, rows)})
+        if not results:
+            if root:
+                return f"No section found with number: {root}" + (f" in spec {spec}" if spec else "")
+            return "No sections found" + (f" for spec {spec}" if spec else "") + "."
+
+        if collapsed:
+            results.append("Sections marked [+] have more levels; pass one as root to expand it.")
+        return "\n".join(results).rstrip()
+
+    except Exception as e:
+        logger.error(f"Section tree error: {e}")
+        return f"Error getting section tree: {str(e)}"
+
+
 @mcp.tool()
 async def get_sqlite_stats() -> str:
     """Get statistics about the SQLite database.
@@ -821,30 +2006,41 @@ async def get_sqlite_stats() -> str:
     """
     logger.info("Getting SQLite database stats")
 
-    try:
+    def build() -> list:
         conn = get_sqlite_connection()
         cursor = conn.cursor()
 
         lines = ["IEEE 802.11 SQLite Database Statistics:", ""]
 
-        # Specifications
-        cursor.execute("SELECT spec_id, spec_name FROM specifications")
+        # Specifications with counts maintained by store_to_db.py
+        try:
+            cursor.execute("""
+                SELECT sp.spec_id, sp.spec_name, st.sections, st.tables, st.figures
+                FROM specifications sp LEFT JOIN spec_stats st ON st.spec_id = sp.spec_id
+                ORDER BY sp.id
+            """)
+        except sqlite3.OperationalError:
+            # Database built before spec_stats existed: grouped counts per table
+            cursor.execute("""
+                SELECT sp.spec_id, sp.spec_name, s.n, t.n, f.n
+                FROM specifications sp
+                LEFT JOIN (SELECT spec_id, COUNT(*) AS n FROM sections GROUP BY spec_id) s ON s.spec_id = sp.spec_id
+                LEFT JOIN (SELECT spec_id, COUNT(*) AS n FROM tables GROUP BY spec_id) t ON t.spec_id = sp.spec_id
+                LEFT JOIN (SELECT spec_id, COUNT(*) AS n FROM figures GROUP BY spec_id) f ON f.spec_id = sp.spec_id
+                ORDER BY sp.id
+            """)
         specs = cursor.fetchall()
         lines.append(f"Specifications: {len(specs)}")
-        for spec_id, spec_name in specs:
-            cursor.execute("SELECT COUNT(*) FROM sections WHERE spec_id = ?", (spec_id,))
-            sec_count = cursor.fetchone()[0]
-            cursor.execute("SELECT COUNT(*) FROM tables WHERE spec_id = ?", (spec_id,))
-            tbl_count = cursor.fetchone()[0]
-            cursor.execute("SELECT COUNT(*) FROM figures WHERE spec_id = ?", (spec_id,))
-            fig_count = cursor.fetchone()[0]
-
+        for spec_id, spec_name, sec_count, tbl_count, fig_count in specs:
             lines.append(f"  [{spec_id}] {spec_name}")
-            lines.append(f"    - Sections: {sec_count}")
-            lines.append(f"    - Tables: {tbl_count}")
-            lines.append(f"    - Figures: {fig_count}")
+            lines.append(f"    - Sections: {sec_count or 0}")
+            lines.append(f"    - Tables: {tbl_count or 0}")
+            lines.append(f"    - Figures: {fig_count or 0}")
+
+        return lines
 
-        conn.close()
+    try:
+        lines = await io_executor.run(build)
 
         lines.append("")
         lines.append(f"Database path: {SQLITE_DB_PATH}")
@@ -856,10 +2052,194 @@ async def get_sqlite_stats() -> str:
         return f"Error getting SQLite stats: {str(e)}"
 
 
+# =============================================================================
+# Full-Text Search (SQLite FTS5)
+# =============================================================================
+
+CONTENT_TYPES = ("section", "table", "figure")
+
+# One SELECT per FTS5 index, normalised to
+# (type, spec_id, number, title, page, snippet, score).
+# bm25() column weights favour titles/captions over body text.
+FTS_QUERIES = {
+    "section": """
+        SELECT 'section', s.spec_id, s.section_number, s.section_title, s.page,
+               snippet(sections_fts, -1, '**', '**', '...', 16),
+               bm25(sections_fts, 5.0, 1.0)
+        FROM sections_fts JOIN sections s ON s.id = sections_fts.rowid
+        WHERE sections_fts MATCH ?{spec_clause}
+    """,
+    "table": """
+        SELECT 'table', t.spec_id, t.table_number, t.caption, t.page,
+               snippet(tables_fts, -1, '**', '**', '...', 16),
+               bm25(tables_fts, 5.0, 1.0)
+        FROM tables_fts JOIN tables t ON t.id = tables_fts.rowid
+        WHERE tables_fts MATCH ?{spec_clause}
+    """,
+    "figure": """
+        SELECT 'figure', f.spec_id, f.figure_number, f.caption, f.page,
+               snippet(figures_fts, -1, '**', '**', '...', 16),
+               bm25(figures_fts)
+        FROM figures_fts JOIN figures f ON f.id = figures_fts.rowid
+        WHERE figures_fts MATCH ?{spec_clause}
+    """,
+}
+
+
+def to_fts_query(query: str, match_any: bool = False) -> str:
+    """Turn free text into an FTS5 query that ANDs every word, or ORs them with match_any.
+
+    Each term is quoted so punctuation in 802.11 names (EHT-MCS, TID-to-link)
+    cannot be parsed as FTS5 operators.
+    """
+    terms = dict.fromkeys(re.findall(r"\w+", query))
+    return (" OR " if match_any else " ").join(f'"{term}"' for term in terms)
+
+
+def keyword_rows(query: str, n_results: int, spec: str = None, content_type: str = None,
+                 match_any: bool = False) -> list:
+    """Run a BM25-ranked full-text search and return normalised rows, best first.
+
+    With match_any a row needs only one of the query's words; BM25 still
+    ranks rows matching more (and rarer) words first.
+    """
+    fts_query = to_fts_query(query, match_any)
+    if not fts_query:
+        return []
+
+    kinds = [content_type] if content_type else CONTENT_TYPES
+    parts = []
+    params = []
+    for kind in kinds:
+        alias = kind[0]
+        spec_clause = f" AND {alias}.spec_id = ?" if spec else ""
+        parts.append(FTS_QUERIES[kind].format(spec_clause=spec_clause))
+        params.append(fts_query)
+        if spec:
+            params.append(spec)
+
+    sql = " UNION ALL ".join(parts) + " ORDER BY 7 LIMIT ?"
+    params.append(n_results)
+    return fetch_all(sql, params)
+
+
+@mcp.tool()
+async def keyword_search(query: str, n_results: int = 10, spec: str = None, content_type: str = None,
+                         output: str = "text") -> str:
+    """Keyword search over sections, tables, and figure captions.
+
+    Uses a full-text index with BM25 ranking. Prefer this over semantic search
+    for exact field or element names (e.g., "EMLSR Padding Delay"). All words
+    in the query must appear in a result.
+
+    Args:
+        query: Words to search for (e.g., "EMLSR Padding Delay")
+        n_results: Number of results to return (default: 10, max: 50)
+        spec: Optional spec filter (e.g., "80211be")
+        content_type: Optional type filter: "section", "table", or "figure"
+        output: "text" (default) or "json" for a structured result
+    """
+    logger.info(f"Keyword search for: {query}" +
+                (f" in spec={spec}" if spec else "") +
+                (f" type={content_type}" if content_type else ""))
+
+    n_results = min(max(1, n_results), 50)
+
+    if content_type and content_type not in CONTENT_TYPES:
+        return f"Invalid content_type: {content_type}. Use one of: {', '.join(CONTENT_TYPES)}"
+    if invalid_output(output):
+        return invalid_output(output)
+
+    try:
+        rows = await io_executor.run(keyword_rows, query, n_results, spec, content_type)
+
+        if output == "json":
+            # bm25() is lower-is-better; reported negated, as in the text output
+            return to_json({"query": query, "results": [
+                {"type": kind, "spec_id": spec_id, "number": number, "title": title,
+                 "page": page, "snippet": snippet, "score": -score}
+                for kind, spec_id, number, title, page, snippet, score in rows
+            ]})
+
+        if not rows:
+            return "No keyword matches found for your query."
+
+        results = []
+        for i, row in enumerate(rows):
+            kind, spec_id, number, title, page, snippet, score = row
+            results.append(f"--- Result {i + 1} ---")
+            results.append(f"[{kind.upper()}] [{spec_id}] {number or 'N/A'} (score: {-score:.2f})")
+            results.append(f"Title: {title}")
+            results.append(f"Page: {page}")
+            results.append(f"Match: {snippet}")
+            results.append("")
+
+        return "\n".join(results)
+
+    except sqlite3.OperationalError as e:
+        logger.error(f"Keyword search error: {e}")
+        if "no such table" in str(e):
+            return "Full-text index not found. Re-run store_to_db.py to build it."
+        return f"Error performing keyword search: {str(e)}"
+    except Exception as e:
+        logger.error(f"Keyword search error: {e}")
+        return f"Error performing keyword search: {str(e)}"
+
+
+@mcp.tool()
+async def get_server_stats() -> str:
+    """Get runtime statistics for the MCP server itself.
+
+    Reports worker pool sizes, queue depth and wait times, which show
+    whether concurrent tool calls are waiting on each other, and the hit
+    ratio and memory use of the query and result caches.
+    """
+    logger.info("Getting server stats")
+
+    lines = ["IEEE 802.11 MCP Server Statistics:", ""]
+    reload_generation, manifest_generation = runtime.index_version()
+    lines.append(f"Index generation: {reload_generation} (manifest generation: {manifest_generation or 'none'})")
+    lines.append("")
+
+    for executor in (io_executor, embed_executor):
+        stats = executor.stats()
+        lines.append(f"Pool {executor.name}:")
+        lines.append(f"  - Workers: {stats['workers']}")
+        lines.append(f"  - Active: {stats['active']}, Queued: {stats['queued']}")
+        lines.append(f"  - Completed: {stats['completed']}")
+        lines.append(f"  - Wait: avg {stats['avg_wait_ms']:.1f} ms, max {stats['max_wait_ms']:.1f} ms")
+        lines.append("")
+
+    for cache in (query_embedding_cache, result_cache):
+        stats = cache.stats()
+        lines.append(f"Cache {cache.name}:")
+        lines.append(f"  - Entries: {stats['entries']}/{stats['max_entries']}"
+                     + (f" (TTL {cache.ttl:.0f}s)" if cache.ttl is not None else ""))
+        lines.append(f"  - Hits: {stats['hits']}, Misses: {stats['misses']} ({stats['hit_ratio']:.1%} hit ratio)")
+        lines.append(f"  - Memory: ~{stats['bytes'] / 1024:.1f} KB")
+        lines.append("")
+
+    return "\n".join(lines).rstrip()
+
+
+def warm_section_tree() -> None:
+    """Build the section tree in the background so the first get_section_tree call is fast."""
+    try:
+        section_tree.get()
+    except Exception as e:
+        logger.warning(f"Section tree not built at startup: {e}")
+
+
 def main():
     """Run the MCP server."""
     logger.info("Starting IEEE 802.11 MCP Server")
-    mcp.run(transport="stdio")
+    threading.Thread(target=warm_section_tree, name="section-tree", daemon=True).start()
+    try:
+        mcp.run(transport="stdio")
+    finally:
+        io_executor.shutdown()
+        embed_executor.shutdown()
+        sqlite_pool.close_all()
 
 
 if __name__ == "__main__":
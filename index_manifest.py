@@ -0,0 +1,122 @@
+"""
+Summary of the ChromaDB collection contents, written at ingestion.
+
+store_to_vectordb.py records entry counts per spec and type, the embedding
+model and a build generation in a small JSON file next to the collection,
+so the MCP server can report statistics without reading every entry back
+out of ChromaDB.
+"""
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+
+MANIFEST_NAME = "ieee80211_manifest.json"
+
+# Entries per collection.get() page when counting
+COUNT_PAGE_SIZE = 5000
+
+# Counts kept per spec: sections, tables and figures, plus the passages the
+# sections were split into. Each passage, table and figure is one entry.
+COUNT_FIELDS = ("section", "passages", "table", "figure")
+ENTRY_FIELDS = ("passages", "table", "figure")
+
+
+def manifest_path(db_path) -> Path:
+    """Location of the manifest for a ChromaDB directory."""
+    return Path(db_path) / MANIFEST_NAME
+
+
+def load_manifest(db_path):
+    """Read the manifest, or return None if the collection was built without one."""
+    path = manifest_path(db_path)
+    if not path.exists():
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def write_manifest(db_path, manifest: dict) -> None:
+    """Write the manifest atomically, so readers never see a partial file."""
+    path = manifest_path(db_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def empty_counts(spec_name: str) -> dict:
+    """Per-spec counts with every field at zero."""
+    return {"spec_name": spec_name, **{field: 0 for field in COUNT_FIELDS}}
+
+
+def has_passage_counts(manifest: dict) -> bool:
+    """
+    Whether a manifest records sections and passages separately.
+
+    Manifests written before passages were recorded stored the passage
+    count under "section".
+    """
+    return all("passages" in counts for counts in manifest["specs"].values())
+
+
+def entry_count(counts: dict) -> int:
+    """Number of collection entries behind a spec's counts."""
+    return sum(counts[field] for field in ENTRY_FIELDS)
+
+
+def count_collection(collection) -> dict:
+    """
+    Count entries per spec and type by paging through metadata only.
+
+    Document text and embeddings are not fetched, so this is much cheaper
+    than collection.get(), but still reads every entry's metadata. Each
+    section's first passage counts it as a section; every passage counts
+    under "passages".
+
+    Returns:
+        {spec: {"spec_name": ..., "section": n, "passages": n, "table": n, "figure": n}}
+    """
+    specs = {}
+    offset = 0
+    while True:
+        page = collection.get(include=["metadatas"], limit=COUNT_PAGE_SIZE, offset=offset)
+        metadatas = page.get("metadatas") or []
+        for meta in metadatas:
+            meta = meta or {}
+            spec = meta.get("spec", "unknown")
+            counts = specs.setdefault(spec, empty_counts(meta.get("spec_name", spec)))
+            content_type = meta.get("type")
+            if content_type == "section":
+                counts["passages"] += 1
+                if not meta.get("chunk_index"):
+                    counts["section"] += 1
+            elif content_type in counts:
+                counts[content_type] += 1
+        if len(metadatas) < COUNT_PAGE_SIZE:
+            return specs
+        offset += COUNT_PAGE_SIZE
+
+
+def build_manifest(specs: dict, collection_name: str, model_name: str, previous: dict = None, **settings) -> dict:
+    """
+    Assemble a manifest for the collection as it stands after an ingestion run.
+
+    Args:
+        specs: Counts per spec, as returned by count_collection()
+        collection_name: ChromaDB collection name
+        model_name: Embedding model used for the entries
+        previous: The manifest being replaced, if any (its generation is incremented)
+        **settings: Ingestion settings worth recording (e.g. chunk sizes)
+    """
+    return {
+        "collection": collection_name,
+        "model": model_name,
+        "generation": (previous or {}).get("generation", 0) + 1,
+        "built_at": datetime.now().isoformat(timespec="seconds"),
+        "total": sum(entry_count(counts) for counts in specs.values()),
+        "specs": specs,
+        **settings,
+    }
@@ -6,13 +6,74 @@ Provides structured queries alongside ChromaDB for semantic search.
 import sqlite3
 import json
 import argparse
+import base64
+import os
 import re
+import time
+from bisect import bisect_right
 from pathlib import Path
 from datetime import datetime
 
+from blob_store import BlobStore, DEFAULT_BLOB_DIR, image_dimensions
+
+# Columns added since the first schema, added in place to existing databases
+ADDED_COLUMNS = {
+    # Numeric sort key and parent for hierarchy browsing
+    "sections": {
+        "sort_key": "TEXT",
+        "parent_section": "TEXT",
+    },
+    # Figure image metadata (the bytes themselves live in the blob store)
+    "figures": {
+        "image_hash": "TEXT",
+        "image_format": "TEXT",
+        "image_width": "INTEGER",
+        "image_height": "INTEGER",
+        "image_bytes": "INTEGER",
+    },
+}
+
+# Content tables reloaded per spec, and their batched insert statements
+BULK_TABLES = ("sections", "tables", "figures")
+INSERT_BATCH = 5000
+INSERT_SQL = {
+    "sections": """
+        INSERT INTO sections (id, spec_id, section_number, section_title, level, page, text,
+                              sort_key, parent_section)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """,
+    "tables": """
+        INSERT INTO tables (id, spec_id, table_number, caption, page, content_markdown, section_number, level)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """,
+    "figures": """
+        INSERT INTO figures (id, spec_id, figure_number, caption, page, image_path,
+                             image_hash, image_format, image_width, image_height, image_bytes,
+                             section_number, level)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """,
+}
+# Sample sections kept per (spec, level) in level_stats
+LEVEL_SAMPLES = 3
+
+INSERT_ANCESTORS_SQL = """
+    INSERT OR IGNORE INTO section_ancestors (spec_id, ancestor, descendant, depth)
+    VALUES (?, ?, ?, ?)
+"""
+
+
+def create_tables(conn: sqlite3.Connection, blobs: BlobStore = None) -> None:
+    """
+    Create database tables if they don't exist, upgrading tables from older versions.
+
+    Args:
+        conn: Database connection
+        blobs: Blob store receiving images still held inline by an older database
+            (defaults to DEFAULT_BLOB_DIR)
+    """
+    # Add new columns first, so the schema's indexes on them can be created
+    added = migrate_schema(conn, blobs or BlobStore(DEFAULT_BLOB_DIR))
 
-def create_tables(conn: sqlite3.Connection) -> None:
-    """Create database tables if they don't exist."""
     schema_path = Path(__file__).parent / "db_schema.sql"
 
     if schema_path.exists():
@@ -39,6 +100,8 @@ def create_tables(conn: sqlite3.Connection) -> None:
                 level INTEGER,
                 page INTEGER,
                 text TEXT,
+                sort_key TEXT,
+                parent_section TEXT,
                 FOREIGN KEY (spec_id) REFERENCES specifications(spec_id)
             );
 
@@ -61,7 +124,11 @@ def create_tables(conn: sqlite3.Connection) -> None:
                 caption TEXT,
                 page INTEGER,
                 image_path TEXT,
-                image_base64 TEXT,
+                image_hash TEXT,
+                image_format TEXT,
+                image_width INTEGER,
+                image_height INTEGER,
+                image_bytes INTEGER,
                 section_number TEXT,
                 level INTEGER,
                 FOREIGN KEY (spec_id) REFERENCES specifications(spec_id)
@@ -70,16 +137,183 @@ def create_tables(conn: sqlite3.Connection) -> None:
             CREATE INDEX IF NOT EXISTS idx_sections_spec ON sections(spec_id);
             CREATE INDEX IF NOT EXISTS idx_sections_number ON sections(section_number);
             CREATE INDEX IF NOT EXISTS idx_sections_page ON sections(page);
+            CREATE INDEX IF NOT EXISTS idx_sections_sort ON sections(spec_id, sort_key);
+            CREATE INDEX IF NOT EXISTS idx_sections_level_sort ON sections(level, spec_id, sort_key);
+            CREATE INDEX IF NOT EXISTS idx_sections_parent ON sections(parent_section, spec_id, sort_key);
             CREATE INDEX IF NOT EXISTS idx_tables_spec ON tables(spec_id);
             CREATE INDEX IF NOT EXISTS idx_tables_number ON tables(table_number);
+            CREATE INDEX IF NOT EXISTS idx_tables_spec_number ON tables(spec_id, table_number);
             CREATE INDEX IF NOT EXISTS idx_tables_section ON tables(section_number);
             CREATE INDEX IF NOT EXISTS idx_figures_spec ON figures(spec_id);
             CREATE INDEX IF NOT EXISTS idx_figures_number ON figures(figure_number);
+            CREATE INDEX IF NOT EXISTS idx_figures_spec_number ON figures(spec_id, figure_number);
             CREATE INDEX IF NOT EXISTS idx_figures_section ON figures(section_number);
+            -- Section hierarchy closure: (ancestor, descendant) pairs, self at depth 0
+            CREATE TABLE IF NOT EXISTS section_ancestors (
+                spec_id TEXT NOT NULL,
+                ancestor TEXT NOT NULL,
+                descendant TEXT NOT NULL,
+                depth INTEGER NOT NULL,
+                PRIMARY KEY (ancestor, spec_id, descendant)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_section_ancestors_spec ON section_ancestors(spec_id, descendant);
+
+            -- Summary counts refreshed by store_to_db.py
+            CREATE TABLE IF NOT EXISTS spec_stats (
+                spec_id TEXT PRIMARY KEY,
+                sections INTEGER NOT NULL,
+                tables INTEGER NOT NULL,
+                figures INTEGER NOT NULL
+            );
+            -- Sections per level, with the first few sections (JSON [[number, title], ...]) as samples
+            CREATE TABLE IF NOT EXISTS level_stats (
+                spec_id TEXT NOT NULL,
+                level INTEGER,
+                sections INTEGER NOT NULL,
+                samples TEXT,
+                PRIMARY KEY (spec_id, level)
+            );
+
+            -- Full-text indexes (external content: text lives only in the tables above)
+            CREATE VIRTUAL TABLE IF NOT EXISTS sections_fts USING fts5(
+                section_title, text,
+                content='sections', content_rowid='id', tokenize='porter unicode61'
+            );
+            CREATE VIRTUAL TABLE IF NOT EXISTS tables_fts USING fts5(
+                caption, content_markdown,
+                content='tables', content_rowid='id', tokenize='porter unicode61'
+            );
+            CREATE VIRTUAL TABLE IF NOT EXISTS figures_fts USING fts5(
+                caption,
+                content='figures', content_rowid='id', tokenize='porter unicode61'
+            );
         """)
+    if ("sections", "sort_key") in added:
+        backfill_hierarchy(conn)
     conn.commit()
 
 
+def migrate_schema(conn: sqlite3.Connection, blobs: BlobStore) -> list:
+    """
+    Bring tables created by an older version up to the current layout.
+
+    Images stored inline (image_base64) are moved to the blob store for
+    every spec in the database, not only those being reloaded, before the
+    column is dropped.
+
+    Returns:
+        (table, column) pairs that were added
+    """
+    added = []
+    for table, new_columns in ADDED_COLUMNS.items():
+        columns = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        if not columns:
+            continue  # New database, the schema creates the table
+        for name, column_type in new_columns.items():
+            if name not in columns:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {column_type}")
+                added.append((table, name))
+
+        if table == "figures" and "image_base64" in columns:
+            migrate_figure_images(conn, blobs)
+            conn.execute("UPDATE figures SET image_base64 = NULL")
+            try:
+                conn.execute("ALTER TABLE figures DROP COLUMN image_base64")
+            except sqlite3.OperationalError:
+                pass  # DROP COLUMN needs SQLite 3.35+; the emptied column is harmless
+    return added
+
+
+def migrate_figure_images(conn: sqlite3.Connection, blobs: BlobStore) -> None:
+    """Move inline base64 figure images into the blob store, a batch of rows at a time."""
+    last_id = 0
+    moved = 0
+    while True:
+        rows = conn.execute("""
+            SELECT id, image_base64 FROM figures
+            WHERE id > ? AND image_base64 IS NOT NULL AND image_base64 != ''
+            ORDER BY id LIMIT ?
+        """, (last_id, INSERT_BATCH)).fetchall()
+        if not rows:
+            break
+        updates = []
+        for row_id, image_base64 in rows:
+            try:
+                data = base64.b64decode(image_base64)
+            except ValueError as e:
+                print(f"  Warning: figure row {row_id} has an unreadable image, skipped: {e}")
+                continue
+            image_hash, image_format = blobs.put(data)
+            width, height = image_dimensions(data)
+            updates.append((image_hash, image_format, width, height, len(data), row_id))
+        conn.executemany("""
+            UPDATE figures
+            SET image_hash = ?, image_format = ?, image_width = ?, image_height = ?, image_bytes = ?
+            WHERE id = ?
+        """, updates)
+        moved += len(updates)
+        last_id = rows[-1][0]
+    if moved:
+        print(f"  Moved {moved} inline figure images to {blobs.root}")
+
+
+def backfill_hierarchy(conn: sqlite3.Connection) -> None:
+    """Fill sort keys, parents and the ancestor closure for sections loaded by an older version."""
+    rows = conn.execute("SELECT id, spec_id, section_number FROM sections").fetchall()
+    conn.executemany(
+        "UPDATE sections SET sort_key = ?, parent_section = ? WHERE id = ?",
+        ((section_sort_key(number or ""), parent_section_number(number or ""), row_id)
+         for row_id, _, number in rows)
+    )
+    conn.executemany(INSERT_ANCESTORS_SQL, (
+        row for _, spec_id, number in rows for row in ancestor_rows(spec_id, number or "")
+    ))
+
+
+def refresh_stats(conn: sqlite3.Connection) -> None:
+    """Recompute spec_stats and level_stats from the content tables with grouped aggregates."""
+    conn.execute("DELETE FROM spec_stats")
+    conn.execute("""
+        INSERT INTO spec_stats (spec_id, sections, tables, figures)
+        SELECT sp.spec_id,
+               COALESCE(s.n, 0), COALESCE(t.n, 0), COALESCE(f.n, 0)
+        FROM specifications sp
+        LEFT JOIN (SELECT spec_id, COUNT(*) AS n FROM sections GROUP BY spec_id) s ON s.spec_id = sp.spec_id
+        LEFT JOIN (SELECT spec_id, COUNT(*) AS n FROM tables GROUP BY spec_id) t ON t.spec_id = sp.spec_id
+        LEFT JOIN (SELECT spec_id, COUNT(*) AS n FROM figures GROUP BY spec_id) f ON f.spec_id = sp.spec_id
+    """)
+
+    samples = {}
+    for spec_id, level, number, title in conn.execute(f"""
+        SELECT spec_id, level, section_number, section_title FROM (
+            SELECT spec_id, level, section_number, section_title,
+                   ROW_NUMBER() OVER (PARTITION BY spec_id, level ORDER BY sort_key, id) AS position
+            FROM sections
+        ) WHERE position <= {LEVEL_SAMPLES}
+    """):
+        samples.setdefault((spec_id, level), []).append([number, title])
+
+    conn.execute("DELETE FROM level_stats")
+    conn.executemany(
+        "INSERT INTO level_stats (spec_id, level, sections, samples) VALUES (?, ?, ?, ?)",
+        ((spec_id, level, count, json.dumps(samples.get((spec_id, level), [])))
+         for spec_id, level, count in conn.execute(
+            "SELECT spec_id, level, COUNT(*) FROM sections GROUP BY spec_id, level"
+         ).fetchall())
+    )
+
+
+def load_figure_image(item: dict) -> bytes:
+    """Get a figure's image bytes from its base64 field, or else from its image file."""
+    if item.get("image_base64"):
+        return base64.b64decode(item["image_base64"])
+    image_path = item.get("image_path")
+    if image_path and os.path.exists(image_path):
+        with open(image_path, "rb") as f:
+            return f.read()
+    return None
+
+
 def extract_section_number(title: str) -> str:
     """Extract section number from title (e.g., '9.4.2.322.2 Basic...' -> '9.4.2.322.2')."""
     match = re.match(r'^([\d.]+)', title.strip())
@@ -100,137 +334,370 @@ def extract_figure_number(caption: str) -> str:
     return match.group(1) if match else ""
 
 
-def find_section_for_page(sections: list, page: int) -> tuple:
+def rebuild_fts(conn: sqlite3.Connection) -> None:
+    """Rebuild the external-content FTS5 indexes from the base tables."""
+    for fts_table in ("sections_fts", "tables_fts", "figures_fts"):
+        conn.execute(f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')")
+
+
+def section_sort_key(section_number: str) -> str:
+    """Fixed-width key that sorts section numbers numerically (e.g., '9.4.2' -> '00009.00004.00002')."""
+    return ".".join(f"{int(part):05d}" for part in section_number.split(".") if part.isdigit())
+
+
+def parent_section_number(section_number: str):
+    """Parent of a section number (e.g., '9.4.2' -> '9.4'), or None for a top-level section."""
+    return section_number.rsplit(".", 1)[0] if "." in section_number else None
+
+
+def ancestor_rows(spec_id: str, section_number: str):
+    """
+    Yield section_ancestors rows (spec_id, ancestor, descendant, depth) for a section.
+
+    Every prefix of the section number is an ancestor, including the section
+    itself at depth 0, so a subtree query matches its root as well.
+    """
+    parts = [part for part in section_number.split(".") if part]
+    for i in range(1, len(parts) + 1):
+        yield spec_id, ".".join(parts[:i]), section_number, len(parts) - i
+
+
+def build_page_index(sections: list) -> tuple:
+    """
+    Sort (page, section_number, level) entries into a page index for find_section_for_page().
+
+    Sections without a page are left out; sections sharing a page keep their
+    document order.
+    """
+    entries = sorted((s for s in sections if s[0] is not None), key=lambda s: s[0])
+    return [page for page, _, _ in entries], [(number, level) for _, number, level in entries]
+
+
+def find_section_for_page(page_index: tuple, page: int) -> tuple:
+    """
+    Find the section that contains a given page by binary search.
+    Returns (section_number, level) of the last section starting on or
+    before the page, or (None, None) if not found.
+    """
+    pages, sections = page_index
+    i = bisect_right(pages, page)
+    return sections[i - 1] if i else (None, None)
+
+
+def recorded_section(item: dict):
     """
-    Find the section that contains a given page.
-    Returns (section_number, level) or (None, None) if not found.
+    Section a table or figure appears in, as recorded by chunk_pdf.py from its position in the document.
+
+    Returns (section_number, level), or None for output from older
+    extractions that did not record it.
+    """
+    if "section_title" not in item:
+        return None
+    title = item["section_title"]
+    return (extract_section_number(title), item.get("section_level")) if title else (None, None)
+
+
+def open_spec_file(path: str) -> tuple:
+    """
+    Open extracted output from chunk_pdf.py in either format, for one or more passes.
+
+    JSONL files are streamed one record at a time and re-read from disk on
+    every pass; only the header line is read up front. JSON files are parsed
+    once (the original format) and each pass iterates the parsed data.
+
+    Returns:
+        (header, records) where header holds the spec metadata and records()
+        returns a fresh iterator of ("section" | "table" | "figure", item) pairs
+    """
+    if str(path).endswith(".jsonl"):
+        with open(path) as f:
+            header = json.loads(f.readline())
+        header.pop("type", None)
+
+        def records():
+            with open(path) as f:
+                f.readline()  # skip header
+                for line in f:
+                    if line.strip():
+                        item = json.loads(line)
+                        yield item.pop("type"), item
+
+        return header, records
+
+    with open(path) as f:
+        data = json.load(f)
+    header = {k: v for k, v in data.items() if k not in ("sections", "tables", "figures")}
+
+    def records():
+        for kind in ("section", "table", "figure"):
+            for item in data.get(f"{kind}s", []):
+                yield kind, item
+
+    return header, records
+
+
+def read_spec_file(path: str) -> tuple:
+    """
+    Open extracted output from chunk_pdf.py for a single pass.
+
+    Returns:
+        (header, records) where header holds the spec metadata and records
+        yields ("section" | "table" | "figure", item) pairs
+    """
+    header, records = open_spec_file(path)
+    return header, records()
+
+
+def resolve_spec_id(header: dict, path: str) -> str:
+    """Get the spec identifier from the file metadata, or infer it from the filename."""
+    spec_id = header.get("spec", "")
+    if not spec_id:
+        # e.g., "80211be_output.json" -> "80211be"
+        filename = Path(path).stem
+        spec_id = filename.replace("_output", "") if filename.endswith("_output") else filename
+    return spec_id
+
+
+def begin_bulk_load(conn: sqlite3.Connection) -> list:
     """
-    # Find sections on or before this page, take the last one
-    matching_sections = [s for s in sections if s.get("page", 0) <= page]
-    if matching_sections:
-        last_section = matching_sections[-1]
-        section_number = extract_section_number(last_section.get("section_title", ""))
-        level = last_section.get("level")
-        return section_number, level
-    return None, None
+    Switch to fast, non-durable settings and drop secondary indexes for a bulk load.
 
+    Nothing is changed if the journal cannot leave WAL (another connection
+    has the database open).
 
-def store_to_db(json_paths: list, db_path: str = "ieee80211.db") -> None:
+    Returns:
+        The CREATE INDEX statements to replay in end_bulk_load(), or None
+        if the load falls back to WAL
     """
-    Load extracted data from JSON files and store in SQLite database.
+    try:
+        mode = conn.execute("PRAGMA journal_mode=MEMORY").fetchone()[0]
+    except sqlite3.OperationalError:
+        mode = "wal"  # a reader is mid-transaction
+    if mode.lower() != "memory":
+        # Leaving WAL needs exclusive access, e.g. the MCP server is still connected.
+        # Load in WAL with the indexes kept, as with --no-bulk.
+        print(f"  Note: database is in use, loading with journal_mode={mode} and indexes kept")
+        return None
+    conn.execute("PRAGMA synchronous=OFF")
+
+    indexes = conn.execute(f"""
+        SELECT name, sql FROM sqlite_master
+        WHERE type = 'index' AND sql IS NOT NULL AND tbl_name IN ({",".join("?" * len(BULK_TABLES))})
+    """, BULK_TABLES).fetchall()
+    for name, _ in indexes:
+        conn.execute(f"DROP INDEX {name}")
+    conn.commit()
+    return [sql for _, sql in indexes]
+
+
+def end_bulk_load(conn: sqlite3.Connection, index_sql: list) -> None:
+    """Recreate the indexes dropped by begin_bulk_load() and restore durable settings."""
+    for sql in index_sql:
+        conn.execute(sql)
+    conn.commit()
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+
+
+def next_row_id(conn: sqlite3.Connection, table: str) -> int:
+    """First unused AUTOINCREMENT id of a table."""
+    seq = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = ?", (table,)).fetchone()
+    max_id = conn.execute(f"SELECT MAX(id) FROM {table}").fetchone()[0]
+    return max(seq[0] if seq else 0, max_id or 0) + 1
+
+
+def store_to_db(json_paths: list, db_path: str = "ieee80211.db", blob_dir: str = DEFAULT_BLOB_DIR,
+                bulk: bool = True) -> None:
+    """
+    Load extracted data from JSON or JSONL files and store in SQLite database.
+
+    Records are inserted as they are read, in executemany batches of
+    INSERT_BATCH rows, so JSONL input is loaded with memory bounded by the
+    number of items rather than their content. Each spec is loaded in a
+    single transaction.
+
+    In bulk mode secondary indexes are dropped for the duration of the
+    load and rebuilt once at the end, with synchronous=OFF and an
+    in-memory journal; the database returns to WAL afterwards. Use
+    bulk=False to load while the MCP server is reading the database.
+
+    Figure images are written to a content-addressed blob store and only
+    their hash, format and dimensions are kept in the figures table.
 
     Args:
-        json_paths: List of paths to JSON files
+        json_paths: List of paths to JSON/JSONL files
         db_path: Path for the SQLite database
+        blob_dir: Directory of the figure image blob store
+        bulk: Drop indexes and relax durability during the load
     """
+    started = time.perf_counter()
     conn = sqlite3.connect(db_path)
-    create_tables(conn)
+    # WAL lets the MCP server keep reading while the database is reloaded
+    conn.execute("PRAGMA journal_mode=WAL")
+    blobs = BlobStore(blob_dir)
+    create_tables(conn, blobs)
     cursor = conn.cursor()
+    index_sql = begin_bulk_load(conn) if bulk else None
 
     spec_counts = {}
+    total_rows = 0
 
-    for json_path in json_paths:
-        print(f"\nProcessing: {json_path}")
-        with open(json_path) as f:
-            data = json.load(f)
-
-        # Get spec identifier
-        spec_id = data.get("spec", "")
-        if not spec_id:
-            filename = Path(json_path).stem
-            spec_id = filename.replace("_output", "") if filename.endswith("_output") else filename
-
-        spec_name = data.get("spec_name", f"IEEE 802.11 ({spec_id})")
-        source_pdf = data.get("source_pdf", "")
-        page_start = data.get("page_range_start")
-        page_end = data.get("page_range_end")
-
-        print(f"  Spec: {spec_id} ({spec_name})")
-
-        # Upsert specification
-        cursor.execute("""
-            INSERT INTO specifications (spec_id, spec_name, source_pdf, extracted_at, page_range_start, page_range_end)
-            VALUES (?, ?, ?, ?, ?, ?)
-            ON CONFLICT(spec_id) DO UPDATE SET
-                spec_name = excluded.spec_name,
-                source_pdf = excluded.source_pdf,
-                extracted_at = excluded.extracted_at,
-                page_range_start = excluded.page_range_start,
-                page_range_end = excluded.page_range_end
-        """, (spec_id, spec_name, source_pdf, datetime.now().isoformat(), page_start, page_end))
-
-        # Delete existing data for this spec (for clean re-runs)
-        cursor.execute("DELETE FROM sections WHERE spec_id = ?", (spec_id,))
-        cursor.execute("DELETE FROM tables WHERE spec_id = ?", (spec_id,))
-        cursor.execute("DELETE FROM figures WHERE spec_id = ?", (spec_id,))
-
-        spec_counts[spec_id] = {"sections": 0, "tables": 0, "figures": 0}
-
-        # Get sections for page-to-section mapping
-        sections = data.get("sections", [])
-
-        # Insert sections
-        for section in sections:
-            section_title = section.get("section_title", "")
-            section_number = extract_section_number(section_title)
-            cursor.execute("""
-                INSERT INTO sections (spec_id, section_number, section_title, level, page, text)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (
-                spec_id,
-                section_number,
-                section_title,
-                section.get("level"),
-                section.get("page"),
-                section.get("text", "")
-            ))
-            spec_counts[spec_id]["sections"] += 1
+    try:
+        for json_path in json_paths:
+            spec_started = time.perf_counter()
+            print(f"\nProcessing: {json_path}")
+            header, records = read_spec_file(json_path)
 
-        # Insert tables
-        for table in data.get("tables", []):
-            caption = table.get("caption", "")
-            table_number = extract_table_number(caption)
-            page = table.get("page")
-            section_number, level = find_section_for_page(sections, page) if page else (None, None)
+            # Get spec identifier
+            spec_id = resolve_spec_id(header, json_path)
 
-            cursor.execute("""
-                INSERT INTO tables (spec_id, table_number, caption, page, content_markdown, section_number, level)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (
-                spec_id,
-                table_number,
-                caption,
-                page,
-                table.get("content", ""),
-                section_number,
-                level
-            ))
-            spec_counts[spec_id]["tables"] += 1
+            spec_name = header.get("spec_name", f"IEEE 802.11 ({spec_id})")
+            source_pdf = header.get("source_pdf", "")
+            page_range = header.get("page_range") or {}
+            page_start = header.get("page_range_start", page_range.get("start"))
+            page_end = header.get("page_range_end", page_range.get("end"))
 
-        # Insert figures
-        for figure in data.get("figures", []):
-            caption = figure.get("caption", "")
-            figure_number = extract_figure_number(caption)
-            page = figure.get("page")
-            section_number, level = find_section_for_page(sections, page) if page else (None, None)
+            print(f"  Spec: {spec_id} ({spec_name})")
 
+            # Upsert specification
             cursor.execute("""
-                INSERT INTO figures (spec_id, figure_number, caption, page, image_path, image_base64, section_number, level)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                spec_id,
-                figure_number,
-                caption,
-                page,
-                figure.get("image_path", ""),
-                figure.get("image_base64", ""),
-                section_number,
-                level
+                INSERT INTO specifications (spec_id, spec_name, source_pdf, extracted_at, page_range_start, page_range_end)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(spec_id) DO UPDATE SET
+                    spec_name = excluded.spec_name,
+                    source_pdf = excluded.source_pdf,
+                    extracted_at = excluded.extracted_at,
+                    page_range_start = excluded.page_range_start,
+                    page_range_end = excluded.page_range_end
+            """, (spec_id, spec_name, source_pdf, datetime.now().isoformat(), page_start, page_end))
+
+            # Delete existing data for this spec (for clean re-runs)
+            for table_name in (*BULK_TABLES, "section_ancestors"):
+                cursor.execute(f"DELETE FROM {table_name} WHERE spec_id = ?", (spec_id,))
+
+            spec_counts[spec_id] = {"sections": 0, "tables": 0, "figures": 0}
+
+            # Ids are assigned here rather than by SQLite so rows can be batched
+            # and still be referenced by the section mapping below
+            next_ids = {table_name: next_row_id(conn, table_name) for table_name in BULK_TABLES}
+            pending = {table_name: [] for table_name in BULK_TABLES}
+
+            def add_row(table_name, row):
+                pending[table_name].append(row)
+                next_ids[table_name] += 1
+                spec_counts[spec_id][table_name] += 1
+                if len(pending[table_name]) >= INSERT_BATCH:
+                    cursor.executemany(INSERT_SQL[table_name], pending[table_name])
+                    pending[table_name].clear()
+
+            # Tables and figures are attributed to the section they appear in when
+            # the extraction recorded it. Older output only has page numbers, so
+            # those items wait until every section's (page, number, level) is known
+            sections = []
+            unassigned = []
+
+            def section_for(table_name, item):
+                section = recorded_section(item)
+                if section is None:
+                    unassigned.append((table_name, next_ids[table_name], item.get("page")))
+                    section = (None, None)
+                return section
+
+            for kind, item in records:
+                if kind == "section":
+                    section_title = item.get("section_title", "")
+                    section_number = extract_section_number(section_title)
+                    add_row("sections", (
+                        next_ids["sections"],
+                        spec_id,
+                        section_number,
+                        section_title,
+                        item.get("level"),
+                        item.get("page"),
+                        item.get("text", ""),
+                        section_sort_key(section_number),
+                        parent_section_number(section_number)
+                    ))
+                    sections.append((item.get("page"), section_number, item.get("level")))
+
+                elif kind == "table":
+                    caption = item.get("caption") or ""
+                    add_row("tables", (
+                        next_ids["tables"],
+                        spec_id,
+                        extract_table_number(caption),
+                        caption,
+                        item.get("page"),
+                        item.get("content", ""),
+                        *section_for("tables", item)
+                    ))
+
+                elif kind == "figure":
+                    caption = item.get("caption") or ""
+                    image = load_figure_image(item)
+                    image_hash = image_format = width = height = None
+                    if image:
+                        image_hash, image_format = blobs.put(image)
+                        width, height = image_dimensions(image)
+                    add_row("figures", (
+                        next_ids["figures"],
+                        spec_id,
+                        extract_figure_number(caption),
+                        caption,
+                        item.get("page"),
+                        item.get("image_path", ""),
+                        image_hash,
+                        image_format,
+                        width,
+                        height,
+                        len(image) if image else None,
+                        *section_for("figures", item)
+                    ))
+
+            for table_name, rows in pending.items():
+                cursor.executemany(INSERT_SQL[table_name], rows)
+
+            # Ancestor closure for subtree queries
+            cursor.executemany(INSERT_ANCESTORS_SQL, (
+                row for _, number, _ in sections for row in ancestor_rows(spec_id, number)
             ))
-            spec_counts[spec_id]["figures"] += 1
+
+            # Assign remaining tables and figures to the section containing their page
+            if unassigned:
+                page_index = build_page_index(sections)
+                for table_name in ("tables", "figures"):
+                    updates = []
+                    for name, row_id, page in unassigned:
+                        if name == table_name:
+                            section_number, level = find_section_for_page(page_index, page) if page else (None, None)
+                            updates.append((section_number, level, row_id))
+                    cursor.executemany(
+                        f"UPDATE {table_name} SET section_number = ?, level = ? WHERE id = ?", updates
+                    )
+
+            conn.commit()
+            rows = sum(spec_counts[spec_id].values())
+            total_rows += rows
+            elapsed = time.perf_counter() - spec_started
+            print(f"  Loaded {rows} rows in {elapsed:.2f}s ({rows / max(elapsed, 1e-9):.0f} rows/s)")
+    except BaseException:
+        conn.rollback()  # discard the spec being loaded; earlier specs are committed
+        raise
+    finally:
+        # Always put the indexes back, so a failed load never leaves the server scanning
+        if index_sql is not None:
+            print("\nRebuilding indexes...")
+            end_bulk_load(conn, index_sql)
+
+    # Refresh full-text indexes and summary counts once all specs are loaded
+    print("\nRebuilding full-text indexes...")
+    rebuild_fts(conn)
+    refresh_stats(conn)
 
     conn.commit()
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
     conn.close()
+    elapsed = time.perf_counter() - started
 
     # Print summary
     print(f"\n{'='*50}")
@@ -241,6 +708,9 @@ def store_to_db(json_paths: list, db_path: str = "ieee80211.db") -> None:
         print(f"    - Sections: {counts['sections']}")
         print(f"    - Tables: {counts['tables']}")
         print(f"    - Figures: {counts['figures']}")
+    print(f"\n  Figure images: {blobs.added} stored, {blobs.reused} already in {blob_dir}")
+    print(f"  Total: {total_rows} rows in {elapsed:.2f}s ({total_rows / max(elapsed, 1e-9):.0f} rows/s, "
+          f"including index and full-text rebuild)")
 
 
 def verify_db(db_path: str = "ieee80211.db") -> None:
@@ -285,14 +755,24 @@ if __name__ == "__main__":
         "--json",
         nargs="+",
         default=["sections_output.json"],
-        help="Path(s) to JSON file(s). Can specify multiple files."
+        help="Path(s) to JSON or JSONL file(s). Can specify multiple files."
     )
     parser.add_argument("--db", default="ieee80211.db", help="Path for SQLite database")
+    parser.add_argument(
+        "--blob-dir",
+        default=DEFAULT_BLOB_DIR,
+        help=f"Directory for figure images, stored once per content hash (default: {DEFAULT_BLOB_DIR})"
+    )
+    parser.add_argument(
+        "--no-bulk",
+        action="store_true",
+        help="Keep indexes and WAL durability during the load (e.g. while the MCP server is running)"
+    )
     parser.add_argument("--verify", action="store_true", help="Verify database contents after storing")
 
     args = parser.parse_args()
 
-    store_to_db(args.json, args.db)
+    store_to_db(args.json, args.db, args.blob_dir, bulk=not args.no_bulk)
 
     if args.verify:
         verify_db(args.db)
@@ -7,138 +7,476 @@ import chromadb
 from chromadb.utils import embedding_functions
 import json
 import argparse
-from pathlib import Path
+import hashlib
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from chunking import chunk_text, count_tokens, DEFAULT_MAX_TOKENS, DEFAULT_OVERLAP_TOKENS
+from index_manifest import (
+    load_manifest, write_manifest, count_collection, build_manifest, empty_counts, has_passage_counts
+)
+from embedding_cache import EmbeddingCache, DEFAULT_CACHE_PATH, DEFAULT_MAX_MB
+from store_to_db import (
+    extract_section_number, extract_table_number, extract_figure_number, open_spec_file, resolve_spec_id
+)
+
+COLLECTION_NAME = "ieee_80211"
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
+# Page size when reading existing IDs back from ChromaDB
+GET_PAGE_SIZE = 5000
+# Documents embedded and written to ChromaDB per batch
+DEFAULT_BATCH_SIZE = 256
 
 
 def get_embedding_function():
     """Get a sentence-transformers based embedding function."""
     return embedding_functions.SentenceTransformerEmbeddingFunction(
-        model_name="all-MiniLM-L6-v2"
+        model_name=EMBEDDING_MODEL
     )
 
 
-def store_to_vectordb(json_paths: list, db_path: str = "./chroma_db") -> chromadb.Collection:
+def get_token_counter(ef=None):
     """
-    Load extracted data from one or more JSON files and store in ChromaDB.
+    Count word pieces with the embedding model's own tokenizer.
+
+    Passages are sized with this so they fit the model's 256 word-piece
+    limit exactly; acronyms like EMLSR split into several pieces that a
+    word count would miss. Falls back to chunking.count_tokens() (a regex
+    approximation) if the tokenizer cannot be loaded.
 
     Args:
-        json_paths: List of paths to JSON files (e.g., ["80211be_output.json", "80211bn_output.json"])
-        db_path: Path for the persistent ChromaDB database
+        ef: Embedding function whose already loaded model is reused, if it has one
+    """
+    try:
+        model = getattr(ef, "_model", None)
+        if model is None:
+            from sentence_transformers import SentenceTransformer
+            model = SentenceTransformer(EMBEDDING_MODEL, device="cpu")
+        tokenizer = model.tokenizer
+    except Exception as e:
+        print(f"Note: model tokenizer unavailable ({e}), sizing passages approximately")
+        return count_tokens
+    return lambda text: len(tokenizer.tokenize(text))
 
-    Returns:
-        The ChromaDB collection
+
+# Per-process model for multi-process embedding (set by _init_embed_worker)
+_worker_model = None
+
+
+def _init_embed_worker(model_name: str) -> None:
+    """Load the embedding model once in each worker process."""
+    global _worker_model
+    from sentence_transformers import SentenceTransformer
+    _worker_model = SentenceTransformer(model_name, device="cpu")
+
+
+def _embed_in_worker(texts: list) -> list:
+    """Embed one batch inside a worker process."""
+    return _worker_model.encode(texts, convert_to_numpy=True).tolist()
+
+
+class BatchEmbedder:
     """
-    # Initialize ChromaDB with persistent storage
-    client = chromadb.PersistentClient(path=db_path)
+    Embed documents in fixed-size batches, in-process or across a process pool.
 
-    # Get embedding function
-    ef = get_embedding_function()
+    With workers > 1 each process loads its own copy of the model and at
+    most two batches per worker are in flight, so memory stays bounded by
+    the batch size rather than the corpus size. Batches are yielded in
+    input order. When a cache is given, only texts missing from it are
+    sent to the model.
+    """
 
-    # Get or create collection (delete if exists for clean re-runs)
-    try:
-        client.delete_collection(name="ieee_80211")
-        print("Deleted existing collection for clean re-run")
-    except Exception:
-        pass  # Collection doesn't exist, that's fine
+    def __init__(self, ef, batch_size: int = DEFAULT_BATCH_SIZE, workers: int = 1,
+                 model_name: str = EMBEDDING_MODEL, cache: EmbeddingCache = None):
+        self.ef = ef
+        self.batch_size = max(1, batch_size)
+        self.workers = max(1, workers)
+        self.model_name = model_name
+        self.cache = cache
+        self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        if self.cache is not None:
+            self.cache.close()
+
+    def batches(self, items):
+        """Yield consecutive lists of at most batch_size items from any iterable."""
+        items = iter(items)
+        while True:
+            batch = list(islice(items, self.batch_size))
+            if not batch:
+                return
+            yield batch
+
+    def _lookup(self, batch: list) -> tuple:
+        """Return (cached embeddings aligned with batch, texts still to embed)."""
+        if self.cache is None:
+            return [None] * len(batch), batch
+        cached = self.cache.get_many(batch)
+        return cached, [text for text, e in zip(batch, cached) if e is None]
+
+    def _merge(self, cached: list, missing: list, computed: list) -> list:
+        """Fill cache misses with freshly computed embeddings and store them."""
+        if self.cache is not None and missing:
+            self.cache.put_many(missing, computed)
+        computed = iter(computed)
+        return [e if e is not None else next(computed) for e in cached]
+
+    def embed(self, entries):
+        """
+        Embed (id, document, metadata) entries batch by batch.
+
+        Yields (batch, embeddings) pairs in input order; entries are only
+        pulled from the iterable as batches are submitted.
+        """
+        if self.workers == 1:
+            for batch in self.batches(entries):
+                cached, missing = self._lookup([doc for _, doc, _ in batch])
+                computed = [list(e) for e in self.ef(missing)] if missing else []
+                yield batch, self._merge(cached, missing, computed)
+            return
+
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_embed_worker,
+                initargs=(self.model_name,)
+            )
+        pending = deque()
+        for batch in self.batches(entries):
+            cached, missing = self._lookup([doc for _, doc, _ in batch])
+            future = self._pool.submit(_embed_in_worker, missing) if missing else None
+            pending.append((batch, cached, missing, future))
+            if len(pending) >= self.workers * 2:
+                batch, cached, missing, future = pending.popleft()
+                yield batch, self._merge(cached, missing, future.result() if future else [])
+        while pending:
+            batch, cached, missing, future = pending.popleft()
+            yield batch, self._merge(cached, missing, future.result() if future else [])
+
+
+def content_hash(text: str) -> str:
+    """Short, stable hash of a string."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def make_id(spec: str, kind: str, number: str, document: str, seen: dict) -> str:
+    """
+    Build a stable, content-derived ID: spec:kind:number:hash(document).
 
-    collection = client.create_collection(
-        name="ieee_80211",
-        metadata={"description": "IEEE 802.11 specification content (multi-spec)"},
-        embedding_function=ef
-    )
+    Identical documents under the same number (rare, e.g. repeated
+    boilerplate passages) are disambiguated by an occurrence counter.
+    """
+    base = f"{spec}:{kind}:{number}:{content_hash(document)}"
+    occurrence = seen.get(base, 0)
+    seen[base] = occurrence + 1
+    return base if occurrence == 0 else f"{base}:{occurrence}"
 
-    documents = []
-    metadatas = []
-    ids = []
-    spec_counts = {}
 
-    # Process each JSON file
-    for json_path in json_paths:
-        print(f"\nProcessing: {json_path}")
-        with open(json_path) as f:
-            data = json.load(f)
-
-        # Get spec identifier from JSON metadata or filename
-        spec = data.get("spec", "")
-        if not spec:
-            # Try to infer from filename (e.g., "80211be_output.json" -> "80211be")
-            filename = Path(json_path).stem
-            if filename.endswith("_output"):
-                spec = filename.replace("_output", "")
-            else:
-                spec = filename
-
-        spec_name = data.get("spec_name", f"IEEE 802.11 ({spec})")
-        print(f"  Spec: {spec} ({spec_name})")
-
-        if spec not in spec_counts:
-            spec_counts[spec] = {"sections": 0, "tables": 0, "figures": 0}
-
-        # Add sections
-        for i, section in enumerate(data.get("sections", [])):
-            text = section.get("text", "")
-            if text and text.strip():
-                documents.append(text)
-                metadatas.append({
-                    "type": "section",
-                    "spec": spec,
-                    "spec_name": spec_name,
-                    "title": section.get("section_title", ""),
-                    "level": section.get("level", 0),
-                    "page": section.get("page", 0)
-                })
-                ids.append(f"{spec}_section_{i}")
-                spec_counts[spec]["sections"] += 1
+def with_meta_hash(metadata: dict) -> dict:
+    """Add a meta_hash field so metadata-only changes can be detected."""
+    metadata["meta_hash"] = content_hash(json.dumps(metadata, sort_keys=True))
+    return metadata
+
 
-        # Add tables (markdown content)
-        for i, table in enumerate(data.get("tables", [])):
-            content = table.get("content", "")
+def iter_entries(records, spec: str, spec_name: str, chunk_tokens: int, chunk_overlap: int,
+                 counts: dict = None, count=count_tokens):
+    """
+    Yield the ChromaDB entries for one spec as (id, document, metadata).
+
+    Args:
+        records: ("section" | "table" | "figure", item) pairs from open_spec_file()
+        spec: Spec identifier
+        spec_name: Human-readable spec name
+        chunk_tokens: Maximum tokens per section passage
+        chunk_overlap: Tokens of overlap between consecutive passages
+        counts: Optional dict updated with section/table/figure/passage counts
+        count: Token counting function for sizing passages (see get_token_counter())
+    """
+    if counts is None:
+        counts = {}
+    for key in ("sections", "tables", "figures", "passages"):
+        counts.setdefault(key, 0)
+    seen = {}
+
+    for kind, item in records:
+        # Sections, one entry per passage
+        if kind == "section":
+            text = item.get("text", "")
+            if text and text.strip():
+                title = item.get("section_title", "")
+                number = extract_section_number(title)
+                passages = chunk_text(text, chunk_tokens, chunk_overlap, count)
+                for j, passage in enumerate(passages):
+                    yield make_id(spec, "section", number, passage, seen), passage, with_meta_hash({
+                        "type": "section",
+                        "spec": spec,
+                        "spec_name": spec_name,
+                        "title": title,
+                        "parent_section": number,
+                        "level": item.get("level") or 0,
+                        "page": item.get("page") or 0,
+                        "chunk_index": j,
+                        "chunk_count": len(passages)
+                    })
+                counts["sections"] += 1
+                counts["passages"] += len(passages)
+
+        # Tables (markdown content)
+        elif kind == "table":
+            content = item.get("content", "")
             if content and content.strip():
-                documents.append(content)
-                metadatas.append({
+                caption = item.get("caption") or ""
+                yield make_id(spec, "table", extract_table_number(caption), content, seen), content, with_meta_hash({
                     "type": "table",
                     "spec": spec,
                     "spec_name": spec_name,
-                    "caption": table.get("caption", ""),
-                    "page": table.get("page", 0)
+                    "caption": caption,
+                    "page": item.get("page") or 0
                 })
-                ids.append(f"{spec}_table_{i}")
-                spec_counts[spec]["tables"] += 1
+                counts["tables"] += 1
 
-        # Add figures (caption only, image referenced by path in metadata)
-        for i, figure in enumerate(data.get("figures", [])):
-            caption = figure.get("caption", "")
+        # Figures (caption only, image referenced by path in metadata)
+        elif kind == "figure":
+            caption = item.get("caption", "")
             if caption and caption.strip():
-                documents.append(caption)
-                metadatas.append({
+                yield make_id(spec, "figure", extract_figure_number(caption), caption, seen), caption, with_meta_hash({
                     "type": "figure",
                     "spec": spec,
                     "spec_name": spec_name,
                     "caption": caption,
-                    "page": figure.get("page", 0),
-                    "image_path": figure.get("image_path", "")
+                    "page": item.get("page") or 0,
+                    "image_path": item.get("image_path") or ""
                 })
-                ids.append(f"{spec}_figure_{i}")
-                spec_counts[spec]["figures"] += 1
-
-    # Store in ChromaDB
-    if documents:
-        collection.add(
-            documents=documents,
-            metadatas=metadatas,
-            ids=ids
+                counts["figures"] += 1
+
+
+def get_stored_hashes(collection: chromadb.Collection, spec: str) -> dict:
+    """Return {id: meta_hash} for everything already stored for a spec."""
+    stored = {}
+    offset = 0
+    while True:
+        page = collection.get(
+            where={"spec": spec},
+            include=["metadatas"],
+            limit=GET_PAGE_SIZE,
+            offset=offset
         )
+        page_ids = page.get("ids", [])
+        for doc_id, meta in zip(page_ids, page.get("metadatas", [])):
+            stored[doc_id] = (meta or {}).get("meta_hash")
+        if len(page_ids) < GET_PAGE_SIZE:
+            return stored
+        offset += GET_PAGE_SIZE
+
+
+def sync_spec(collection: chromadb.Collection, embedder: BatchEmbedder, spec: str, entries) -> dict:
+    """
+    Bring the stored entries for one spec in line with the freshly built ones.
+
+    New IDs (new or changed text) are embedded and added, IDs whose text is
+    unchanged but metadata moved are updated without re-embedding, and IDs
+    no longer produced are deleted. All writes go to ChromaDB in batches of
+    embedder.batch_size.
+
+    The entries are streamed twice: once to collect IDs and metadata hashes
+    for the diff, and once to write the changes, so document text is never
+    all held in memory.
+
+    Args:
+        collection: The ChromaDB collection
+        embedder: Batch embedder used for new entries
+        spec: Spec identifier
+        entries: Callable returning a fresh iterator of (id, document, metadata)
+
+    Returns:
+        Counts of added, updated, removed and unchanged entries plus embed time
+    """
+    stored = get_stored_hashes(collection, spec)
+    current = {doc_id: meta["meta_hash"] for doc_id, _, meta in entries()}
+
+    added = {doc_id for doc_id in current if doc_id not in stored}
+    updated = {doc_id for doc_id, meta_hash in current.items()
+               if doc_id in stored and stored[doc_id] != meta_hash}
+    removed = [doc_id for doc_id in stored if doc_id not in current]
+
+    for batch in embedder.batches(removed):
+        collection.delete(ids=batch)
+
+    if updated:
+        changed = (entry for entry in entries() if entry[0] in updated)
+        for batch in embedder.batches(changed):
+            collection.update(
+                ids=[doc_id for doc_id, _, _ in batch],
+                metadatas=[meta for _, _, meta in batch]
+            )
+
+    embed_seconds = 0.0
+    if added:
+        started = time.perf_counter()
+        done = 0
+        new_entries = (entry for entry in entries() if entry[0] in added)
+        for batch, embeddings in embedder.embed(new_entries):
+            collection.add(
+                ids=[doc_id for doc_id, _, _ in batch],
+                documents=[doc for _, doc, _ in batch],
+                metadatas=[meta for _, _, meta in batch],
+                embeddings=embeddings
+            )
+            done += len(batch)
+            rate = done / (time.perf_counter() - started)
+            print(f"\r  Embedded {done}/{len(added)} ({rate:.0f}/s)", end="", file=sys.stderr, flush=True)
+        print(file=sys.stderr)
+        embed_seconds = time.perf_counter() - started
+
+    return {
+        "added": len(added),
+        "updated": len(updated),
+        "removed": len(removed),
+        "unchanged": len(current) - len(added) - len(updated),
+        "embed_seconds": embed_seconds,
+    }
+
+
+def store_to_vectordb(json_paths: list, db_path: str = "./chroma_db",
+                      chunk_tokens: int = DEFAULT_MAX_TOKENS,
+                      chunk_overlap: int = DEFAULT_OVERLAP_TOKENS,
+                      rebuild: bool = False,
+                      batch_size: int = DEFAULT_BATCH_SIZE,
+                      workers: int = 1,
+                      cache_path: str = DEFAULT_CACHE_PATH,
+                      cache_max_mb: int = DEFAULT_MAX_MB) -> chromadb.Collection:
+    """
+    Load extracted data from one or more JSON/JSONL files and store in ChromaDB.
+
+    Long sections are split into overlapping passages so that all of their
+    text is embedded; each passage carries its section number in the
+    parent_section metadata field.
+
+    Indexing is incremental: entry IDs are derived from spec, kind, number
+    and a hash of the text, so only new or changed entries are embedded and
+    entries that disappeared from a spec are deleted. Specs not listed in
+    json_paths are left untouched.
+
+    Args:
+        json_paths: List of paths to JSON files (e.g., ["80211be_output.json", "80211bn_output.json"])
+        db_path: Path for the persistent ChromaDB database
+        chunk_tokens: Maximum tokens per section passage (0 embeds whole sections)
+        chunk_overlap: Tokens of overlap between consecutive passages
+        rebuild: Delete the whole collection first and re-embed everything
+        batch_size: Documents embedded and written per batch
+        workers: Embedding processes (1 embeds in-process)
+        cache_path: On-disk embedding cache consulted before encoding (None disables it)
+        cache_max_mb: Size cap for the embedding cache; least recently used entries are evicted
+
+    Returns:
+        The ChromaDB collection
+    """
+    # Initialize ChromaDB with persistent storage
+    client = chromadb.PersistentClient(path=db_path)
+
+    # Get embedding function, and its tokenizer for sizing passages
+    ef = get_embedding_function()
+    count = get_token_counter(ef) if chunk_tokens > 0 else count_tokens
+
+    if rebuild:
+        try:
+            client.delete_collection(name=COLLECTION_NAME)
+            print("Deleted existing collection for full rebuild")
+        except Exception:
+            pass  # Collection doesn't exist, that's fine
+
+    collection = client.get_or_create_collection(
+        name=COLLECTION_NAME,
+        metadata={"description": "IEEE 802.11 specification content (multi-spec)"},
+        embedding_function=ef
+    )
+
+    spec_counts = {}
+    spec_names = {}
+    sync_counts = {}
+    cache = EmbeddingCache(cache_path, EMBEDDING_MODEL, cache_max_mb) if cache_path else None
+    embedder = BatchEmbedder(ef, batch_size, workers, cache=cache)
+
+    # Process each JSON file
+    with embedder:
+        for json_path in json_paths:
+            print(f"\nProcessing: {json_path}")
+            # JSON is parsed once here; JSONL only has its header line read
+            header, records = open_spec_file(json_path)
+
+            # Get spec identifier from JSON metadata or filename
+            spec = resolve_spec_id(header, json_path)
+
+            spec_name = header.get("spec_name", f"IEEE 802.11 ({spec})")
+            print(f"  Spec: {spec} ({spec_name})")
+
+            counts = {}
+            spec_counts[spec] = counts
+            spec_names[spec] = spec_name
+
+            def entries(records=records, spec=spec, spec_name=spec_name, counts=counts):
+                # Each pass streams JSONL from disk again, or walks the already parsed JSON
+                counts.clear()
+                return iter_entries(records(), spec, spec_name, chunk_tokens, chunk_overlap, counts, count)
+
+            sync_counts[spec] = sync_spec(collection, embedder, spec, entries)
+            print(f"  Added {sync_counts[spec]['added']}, updated {sync_counts[spec]['updated']}, "
+                  f"removed {sync_counts[spec]['removed']}, unchanged {sync_counts[spec]['unchanged']}")
+
+    # Record what the collection now holds, for get_database_stats and list_specs
+    previous = load_manifest(db_path)
+    if rebuild:
+        specs = {}
+    elif previous is not None and has_passage_counts(previous):
+        specs = previous["specs"]
+    else:
+        specs = count_collection(collection)  # first (or outdated) manifest for an existing collection
+    for spec, counts in spec_counts.items():
+        specs[spec] = empty_counts(spec_names[spec])
+        specs[spec].update(section=counts["sections"], passages=counts["passages"],
+                           table=counts["tables"], figure=counts["figures"])
+    manifest = build_manifest(specs, COLLECTION_NAME, EMBEDDING_MODEL, previous,
+                              chunk_tokens=chunk_tokens, chunk_overlap=chunk_overlap)
+    write_manifest(db_path, manifest)
 
     # Print summary
+    total_entries = sum(c["added"] + c["updated"] + c["unchanged"] for c in sync_counts.values())
     print(f"\n{'='*50}")
-    print(f"Stored {len(documents)} items in ChromaDB:")
+    print(f"Stored {total_entries} entries in ChromaDB:")
     for spec, counts in spec_counts.items():
-        total = sum(counts.values())
+        total = counts["sections"] + counts["tables"] + counts["figures"]
+        sync = sync_counts[spec]
         print(f"\n  [{spec}] {total} items:")
-        print(f"    - Sections: {counts['sections']}")
+        print(f"    - Sections: {counts['sections']} ({counts['passages']} passages)")
         print(f"    - Tables: {counts['tables']}")
         print(f"    - Figures: {counts['figures']}")
-    print(f"\nDatabase path: {db_path}")
+        print(f"    - Entries added: {sync['added']}, updated: {sync['updated']}, "
+              f"removed: {sync['removed']}, unchanged: {sync['unchanged']}")
+
+    # Estimate time saved from the embedding rate measured in this run
+    embedded = sum(c["added"] for c in sync_counts.values())
+    embed_seconds = sum(c["embed_seconds"] for c in sync_counts.values())
+    skipped = sum(c["unchanged"] + c["updated"] for c in sync_counts.values())
+    print(f"\nEmbedded {embedded} entries in {embed_seconds:.1f}s, reused embeddings for {skipped}")
+    if embedded and skipped:
+        print(f"Estimated time saved: {embed_seconds / embedded * skipped:.1f}s")
+    if cache is not None:
+        print(f"Embedding cache: {cache.hits} hits, {cache.misses} misses ({cache_path})")
+    print(f"\nDatabase path: {db_path} (manifest generation {manifest['generation']})")
 
     return collection
 
@@ -157,7 +495,7 @@ def search(query: str, n_results: int = 3, db_path: str = "./chroma_db") -> dict
     """
     client = chromadb.PersistentClient(path=db_path)
     ef = get_embedding_function()
-    collection = client.get_collection("ieee_80211", embedding_function=ef)
+    collection = client.get_collection(COLLECTION_NAME, embedding_function=ef)
 
     results = collection.query(
         query_texts=[query],
@@ -195,16 +533,66 @@ if __name__ == "__main__":
         "--json",
         nargs="+",
         default=["sections_output.json"],
-        help="Path(s) to JSON file(s). Can specify multiple files for multi-spec support."
+        help="Path(s) to JSON or JSONL file(s). Can specify multiple files for multi-spec support."
     )
     parser.add_argument("--db", default="./chroma_db", help="Path for ChromaDB")
     parser.add_argument("--query", help="Optional: run a search query after storing")
     parser.add_argument("--search-only", action="store_true", help="Only search, don't store")
     parser.add_argument("-n", type=int, default=3, help="Number of results for search")
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Delete the collection and re-embed everything instead of updating incrementally"
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help=f"Documents embedded and written per batch (default: {DEFAULT_BATCH_SIZE})"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Embedding processes for multi-core CPU encoding (default: 1, in-process)"
+    )
+    parser.add_argument(
+        "--cache",
+        default=DEFAULT_CACHE_PATH,
+        help=f"Path of the on-disk embedding cache (default: {DEFAULT_CACHE_PATH})"
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Do not read or write the embedding cache")
+    parser.add_argument(
+        "--cache-max-mb",
+        type=int,
+        default=DEFAULT_MAX_MB,
+        help=f"Embedding cache size cap in MB, least recently used evicted first (default: {DEFAULT_MAX_MB})"
+    )
+    parser.add_argument(
+        "--cache-evict-model",
+        metavar="MODEL",
+        help="Delete all cached embeddings for MODEL and exit"
+    )
+    parser.add_argument(
+        "--chunk-tokens",
+        type=int,
+        default=DEFAULT_MAX_TOKENS,
+        help=f"Max tokens per section passage, 0 to embed whole sections (default: {DEFAULT_MAX_TOKENS})"
+    )
+    parser.add_argument(
+        "--chunk-overlap",
+        type=int,
+        default=DEFAULT_OVERLAP_TOKENS,
+        help=f"Tokens of overlap between section passages (default: {DEFAULT_OVERLAP_TOKENS})"
+    )
 
     args = parser.parse_args()
 
-    if args.search_only:
+    if args.cache_evict_model:
+        with EmbeddingCache(args.cache, args.cache_evict_model, args.cache_max_mb) as cache:
+            removed = cache.evict_model(args.cache_evict_model)
+        print(f"Removed {removed} cached embeddings for {args.cache_evict_model}")
+    elif args.search_only:
         if args.query:
             print(f"Searching for: {args.query}")
             results = search(args.query, n_results=args.n, db_path=args.db)
@@ -213,7 +601,17 @@ if __name__ == "__main__":
             print("Error: --query required with --search-only")
     else:
         # Store data from all JSON files
-        store_to_vectordb(args.json, args.db)
+        store_to_vectordb(
+            args.json,
+            args.db,
+            chunk_tokens=args.chunk_tokens,
+            chunk_overlap=args.chunk_overlap,
+            rebuild=args.rebuild,
+            batch_size=args.batch_size,
+            workers=args.workers,
+            cache_path=None if args.no_cache else args.cache,
+            cache_max_mb=args.cache_max_mb
+        )
 
         # Run optional query
         if args.query: